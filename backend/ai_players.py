@@ -4,29 +4,41 @@ Agents IA pour le jeu du Loup-Garou avec Anthropic Claude
 import os
 import json
 import random
+import asyncio
+import time
 from dataclasses import dataclass, field
-from typing import Optional
-import anthropic
+from typing import TYPE_CHECKING, Optional
 import re
-from dotenv import load_dotenv
-load_dotenv()
+
+if TYPE_CHECKING:
+    import anthropic
 
 from .models import Player, Role, GameState, Phase
+from .llm_scheduler import get_llm_scheduler
+from .llm_deadlines import HEDGE_PERCENTILE, hedged_call, latency_tracker, remaining_time
+from .metrics import LLM_CALL_SECONDS, LLM_CALLS_IN_FLIGHT
+from .llm_usage import get_usage_ledger, usage_from_response
+from .llm_replay import LLM_BACKEND, RECORD, LLMUnavailable, get_replay_store
+from .log import get_logger
+from .tracing import span
+
+ai_log = get_logger("ai")
 
 
 # Client Anthropic (initialisé avec la clé API)
-_anthropic_client: Optional[anthropic.Anthropic] = None
+_anthropic_client: Optional["anthropic.Anthropic"] = None
 
 MALE_VOICES = ["axlOaUiFyOZhy4nv", "Hdf5cdfaGrLDTD63", "IB53xJtufx1sbfbt", "B09t5S64xLaKwXeW"]
 FEMALE_VOICES = ["1VAVLmmbQFDw7TMn", "GmGF_3ETsY2Zq7_w", "p1fSBpcmVWngBqVd", "3mM3xaoFjNMQa22C"]
 
-def get_anthropic_client() -> anthropic.Anthropic:
-    """Récupère ou crée le client Anthropic"""
+def get_anthropic_client() -> "anthropic.Anthropic":
+    """Récupère ou crée le client Anthropic (le SDK, long à importer, n'est chargé qu'ici)"""
     global _anthropic_client
     if _anthropic_client is None:
         api_key = os.environ.get("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+        import anthropic
         _anthropic_client = anthropic.Anthropic(api_key=api_key)
     return _anthropic_client
 
@@ -34,6 +46,7 @@ def get_anthropic_client() -> anthropic.Anthropic:
 def set_anthropic_api_key(api_key: str):
     """Configure la clé API Anthropic"""
     global _anthropic_client
+    import anthropic
     _anthropic_client = anthropic.Anthropic(api_key=api_key)
 
 
@@ -126,6 +139,7 @@ class AIMemory:
     votes_history: list[dict] = field(default_factory=list)
     deaths_witnessed: list[dict] = field(default_factory=list)
     conversations: list[dict] = field(default_factory=list)
+    day_summaries: dict[int, str] = field(default_factory=dict)  # jour -> note condensée
 
 
 class AIAgent:
@@ -138,6 +152,97 @@ class AIAgent:
         self.memory = AIMemory()
         self.model = "claude-haiku-4-5-20251001"
 
+    async def _create_message(self, system_prompt: str, user_prompt: str, max_tokens: int, call_type: str):
+        """
+        Appelle l'API Anthropic sans bloquer la boucle d'événements, dans l'échéance courante.
+        Un appel plus lent que le percentile habituel de son type est doublé, sauf si
+        l'ordonnanceur a déjà des appels en attente.
+        Avec LLM_BACKEND=offline ou replay, aucun appel réseau n'est fait.
+        """
+        if LLM_BACKEND == "offline":
+            raise LLMUnavailable("LLM_BACKEND=offline")
+        if LLM_BACKEND == "replay":
+            return get_replay_store().response(self.model, system_prompt, user_prompt, max_tokens)
+        timeout = remaining_time()
+        if timeout is not None and timeout <= 0:
+            raise TimeoutError("LLM deadline already exceeded")
+        # Au-delà du budget de la partie : TokenBudgetExceeded, et les appelants utilisent leur repli
+        within_budget = get_usage_ledger().check_budget(self.game_state.game_id, call_type)
+        with span(
+            f"llm.{call_type}",
+            game_id=self.game_state.game_id, day=self.game_state.day_number, player=self.player.name
+        ):
+            return await hedged_call(
+                lambda started: self._send_message(system_prompt, user_prompt, max_tokens, call_type, started),
+                # Proche du budget, pas de requête de couverture (elle double le coût)
+                hedge_after=latency_tracker.percentile(call_type, HEDGE_PERCENTILE) if within_budget else None,
+                timeout=timeout,
+                can_hedge=lambda: get_llm_scheduler().queue_depth() == 0
+            )
+
+    async def _send_message(
+        self, system_prompt: str, user_prompt: str, max_tokens: int, call_type: str,
+        started: Optional[asyncio.Event] = None
+    ):
+        """Un appel unique à l'API, via l'ordonnanceur global ; started est levé une fois la place obtenue"""
+        client = get_anthropic_client()
+        # Tous les appels passent par l'ordonnanceur global (budgets et priorités)
+        scheduler = get_llm_scheduler()
+        with span("llm.queue"):
+            grant = await scheduler.acquire(
+                self.game_state.game_id,
+                scheduler.estimate_tokens(system_prompt + user_prompt, max_tokens)
+            )
+        if started is not None:
+            started.set()
+        start = time.perf_counter()
+        # Un thread ne s'interrompt pas : le délai du client le borne à l'échéance courante
+        timeout = remaining_time()
+        options = {"timeout": max(timeout, 1.0)} if timeout is not None else {}
+        # Le client est synchrone : l'exécuter dans un thread permet aux appels lancés
+        # via asyncio.gather de s'exécuter réellement en parallèle
+        with span("llm.request", model=self.model), LLM_CALLS_IN_FLIGHT.track():
+            call = asyncio.ensure_future(asyncio.to_thread(
+                client.messages.create,
+                model=self.model,
+                max_tokens=max_tokens,
+                system=system_prompt,
+                messages=[
+                    {"role": "user", "content": user_prompt}
+                ],
+                **options
+            ))
+            try:
+                response = await asyncio.shield(call)
+            except asyncio.CancelledError:
+                # Copie perdante d'un hedging : ses tokens sont facturés, on les compte à son retour
+                def record_late(future: asyncio.Future):
+                    if not future.cancelled() and future.exception() is None:
+                        self._record_usage(grant, call_type, future.result())
+
+                call.add_done_callback(record_late)
+                raise
+        elapsed = time.perf_counter() - start
+        latency_tracker.record(call_type, elapsed)
+        ai_log.debug("Appel %s pour %s terminé en %.2fs", call_type, self.player.name, elapsed)
+        LLM_CALL_SECONDS.observe(elapsed, call_type=call_type)
+        if RECORD and response.content:
+            await asyncio.to_thread(
+                get_replay_store().record,
+                self.model, system_prompt, user_prompt, max_tokens, call_type, response.content[0].text
+            )
+        self._record_usage(grant, call_type, response)
+        return response
+
+    def _record_usage(self, grant, call_type: str, response):
+        """Consommation réelle d'un appel, pour l'ordonnanceur et le registre de la partie"""
+        usage = usage_from_response(response, self.model)
+        if usage.calls:
+            get_llm_scheduler().record_usage(grant, usage.input_tokens + usage.output_tokens)
+            get_usage_ledger().record(
+                self.game_state.game_id, self.player.name, call_type, self.game_state.day_number, usage
+            )
+
     def _build_system_prompt(self) -> str:
         """Build the system prompt for the agent"""
         role_info = self._get_role_info()
@@ -208,6 +313,11 @@ Observe suspicious behaviors."""
             known = [f"{n}: {r}" for n, r in self.memory.known_roles.items()]
             context += f"- Roles you know: {', '.join(known)}\n"
 
+        if self.memory.day_summaries:
+            context += "- Your notes from previous days:\n"
+            for day, note in sorted(self.memory.day_summaries.items()):
+                context += f"  * Day {day}: {note}\n"
+
         if self.memory.conversations:
             recent = self.memory.conversations[-5:]  # Last 5 messages
             context += "- Recent discussions:\n"
@@ -244,15 +354,7 @@ Your response must be in the following JSON format:
 """
 
         try:
-            client = get_anthropic_client()
-            response = client.messages.create(
-                model=self.model,
-                max_tokens=150,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
+            response = await self._create_message(system_prompt, user_prompt, max_tokens=150, call_type="discussion")
             return response.content[0].text.strip()
         except Exception as e:
             # Fallback en cas d'erreur
@@ -267,7 +369,8 @@ Your response must be in the following JSON format:
             "We should observe more carefully.",
             "I'm not sure who to vote for.",
         ]
-        return random.choice(fallbacks)
+        # Même format JSON que la réponse du modèle
+        return json.dumps({"content": random.choice(fallbacks), "name": ""})
 
     async def generate_vote(self, discussions: list[dict]) -> dict:
         """Génère le vote du jour"""
@@ -291,15 +394,7 @@ Respond ONLY with a JSON in this form:
 {{"vote": "PlayerName", "reasoning": "Brief explanation"}}"""
 
         try:
-            client = get_anthropic_client()
-            response = client.messages.create(
-                model=self.model,
-                max_tokens=100,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
+            response = await self._create_message(system_prompt, user_prompt, max_tokens=100, call_type="vote")
 
             content = response.content[0].text.strip()
             # Parser le JSON
@@ -316,8 +411,7 @@ Respond ONLY with a JSON in this form:
                 if candidate.lower() in content.lower():
                     return {"vote": candidate, "reasoning": "Vote basé sur les discussions"}
                 else : 
-                    print("Mauvais format Json !!!!")
-                    print(candidate)
+                    ai_log.debug("Vote de %s : JSON invalide, %s absent de la réponse", self.player.name, candidate)
 
             # Fallback
             return {"vote": random.choice(candidates), "reasoning": "Vote aléatoire"}
@@ -349,15 +443,7 @@ Respond ONLY with a JSON:
 {{"target": "PlayerName"}}"""
 
         try:
-            client = get_anthropic_client()
-            response = client.messages.create(
-                model=self.model,
-                max_tokens=100,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
+            response = await self._create_message(system_prompt, user_prompt, max_tokens=100, call_type="wolf_vote")
 
             content = response.content[0].text.strip()
             try:
@@ -365,8 +451,7 @@ Respond ONLY with a JSON:
                 if result.get("target") in targets:
                     return result
             except json.JSONDecodeError:
-                print("Erreur 336")
-                pass
+                ai_log.debug("Vote loup de %s : JSON invalide, recherche du nom dans %r", self.player.name, content)
 
             # Chercher le nom du joueur dans la réponse
             found_targets = [target for target in targets if target.lower() in content.lower()]
@@ -403,15 +488,7 @@ Respond ONLY with a JSON:
 {{"target": "PlayerName"}}"""
 
         try:
-            client = get_anthropic_client()
-            response = client.messages.create(
-                model=self.model,
-                max_tokens=100,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
+            response = await self._create_message(system_prompt, user_prompt, max_tokens=100, call_type="seer")
 
             content = response.content[0].text.strip()
             try:
@@ -455,15 +532,7 @@ Respond ONLY with a JSON:
 {{"save": true/false, "kill": "PlayerName" or null, "reasoning": "Explanation"}}"""
 
         try:
-            client = get_anthropic_client()
-            response = client.messages.create(
-                model=self.model,
-                max_tokens=100,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
+            response = await self._create_message(system_prompt, user_prompt, max_tokens=100, call_type="witch")
 
             content = response.content[0].text.strip()
             try:
@@ -481,6 +550,44 @@ Respond ONLY with a JSON:
         except Exception as e:
             return {"save": False, "kill": None, "reasoning": f"Erreur: {str(e)}"}
 
+    async def summarize_day(self, day: int, discussions: list[dict], votes: dict[str, str], deaths: list[str]) -> str:
+        """Condense la journée écoulée en une note courte gardée en mémoire"""
+        transcript = chr(10).join([f"- {d['player']}: {d['message']}" for d in discussions]) or "- (no discussion)"
+        votes_str = ", ".join([f"{voter} -> {target}" for voter, target in votes.items()]) or "none"
+        deaths_str = chr(10).join([f"- {death}" for death in deaths]) or "- none"
+
+        user_prompt = f"""Day {day} is over. Here is what happened.
+
+Discussions:
+{transcript}
+
+Votes: {votes_str}
+
+Deaths:
+{deaths_str}
+
+Write a private note for yourself (2-3 sentences max) summarizing what matters for the rest of the game:
+who accused whom, suspicious votes, and what the deaths revealed.
+Respond ONLY with the note, no preamble."""
+
+        try:
+            response = await self._create_message(self._build_system_prompt(), user_prompt, max_tokens=120, call_type="summary")
+            note = response.content[0].text.strip()
+        except Exception:
+            note = self._fallback_summary(votes, deaths)
+
+        self.memory.day_summaries[day] = note
+        return note
+
+    def _fallback_summary(self, votes: dict[str, str], deaths: list[str]) -> str:
+        """Note minimale si l'API échoue"""
+        parts = []
+        if votes:
+            parts.append("Votes: " + ", ".join([f"{voter} -> {target}" for voter, target in votes.items()]) + ".")
+        if deaths:
+            parts.append(" ".join(deaths))
+        return " ".join(parts) or "Nothing notable happened."
+
     def update_memory(self, event_type: str, data: dict):
         """Met à jour la mémoire de l'agent"""
         if event_type == "role_revealed":
@@ -2,23 +2,76 @@
 API FastAPI pour le jeu du Loup-Garou
 Avec agents IA Anthropic Claude
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional
+from contextlib import asynccontextmanager
+import asyncio
 import os
+import struct
 from dotenv import load_dotenv
+
+# Load .env once, before the modules that read their settings at import time
+load_dotenv()
+
 from .game_engine import engine
-from .models import Role
-from .ai_players import set_anthropic_api_key
+from .models import GameStatus, Role
+from .ai_players import get_anthropic_client, set_anthropic_api_key
 from .tts_services import get_tts_service, set_gradium_api_key
+from .llm_scheduler import get_llm_scheduler
+from .llm_usage import GameUsage, get_usage_ledger
+from .jobs import GameBusy, Job, JobQueueFull, get_job_queue
+from .snapshots import SnapshotError, get_snapshot_store, restore_game, snapshot_game, snapshot_game_id
+from .metrics import LIVE_GAMES, REGISTRY
+from .log import configure_logging, get_logger, shutdown_logging
+from .tracing import chrome_trace, traces_for_game
+from .profiling import ProfilingMiddleware, profiling_settings
+
+configure_logging()
+api_log = get_logger("api")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Pre-warm clients when configured (ANTHROPIC_PREWARM, TTS_WARMUP), otherwise they are
+    created on first use; restore games snapshotted in SNAPSHOT_DIR.
+    On shutdown, stop the job workers, snapshot every game, close clients and the log writer
+    """
+    configure_logging()
+    snapshot_store = get_snapshot_store()
+    if snapshot_store:
+        restored = await asyncio.to_thread(snapshot_store.restore_all, engine)
+        api_log.info("Restored %d game(s) from %s", restored, snapshot_store.directory)
+    if os.getenv("ANTHROPIC_PREWARM", "0") == "1" and os.getenv("ANTHROPIC_API_KEY"):
+        # Importing the SDK and building the client takes about a second: keep it off the loop
+        await asyncio.to_thread(get_anthropic_client)
+    tts_service = get_tts_service()
+    if tts_service:
+        try:
+            await asyncio.wait_for(
+                tts_service.start(warm_up=os.getenv("TTS_WARMUP", "0") == "1"),
+                timeout=float(os.getenv("TTS_WARMUP_TIMEOUT", "10"))
+            )
+        except asyncio.TimeoutError:
+            api_log.warning("TTS warm-up timed out, continuing cold")
+    yield
+    await get_job_queue().close()
+    if snapshot_store:
+        saved = snapshot_store.save_all(engine)
+        api_log.info("Snapshotted %d game(s) to %s", saved, snapshot_store.directory)
+    if tts_service:
+        await tts_service.close()
+    shutdown_logging()
+
 
-load_dotenv()
 app = FastAPI(
     title="Werewolf Game API",
     description="API to play Werewolf with Anthropic Claude AI agents",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS to allow calls from frontend
@@ -28,8 +81,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Audio format and job headers read by the frontend
+    expose_headers=[
+        "X-Sample-Rate", "X-Channels", "X-Bit-Depth", "X-Frame-Header", "X-Line-Count",
+        "Location", "Retry-After",
+    ],
 )
 
+# Opt-in profiling (PROFILING=1): requests with an X-Profile header, or a sampled fraction
+if (profiling := profiling_settings()) is not None:
+    app.add_middleware(ProfilingMiddleware, **profiling)
+
 
 # --- Pydantic Models ---
 
@@ -43,6 +105,7 @@ class CreateGameRequest(BaseModel):
     num_wolves: int = Field(default=2, ge=1, le=3, description="Number of werewolves")
     include_seer: bool = Field(default=True, description="Include the Seer")
     include_witch: bool = Field(default=True, description="Include the Witch")
+    token_budget: Optional[int] = Field(default=None, ge=0, description="LLM token budget for this game (0 = unlimited)")
 
 
 class PlayerActionRequest(BaseModel):
@@ -89,7 +152,8 @@ async def create_game(request: CreateGameRequest):
         num_players=request.num_players,
         num_wolves=request.num_wolves,
         include_seer=request.include_seer,
-        include_witch=request.include_witch
+        include_witch=request.include_witch,
+        token_budget=request.token_budget
     )
 
     human_player = next(p for p in game.players if p.is_human)
@@ -130,9 +194,42 @@ async def get_game_state(game_id: str):
     return game.to_dict(player_perspective=player_name)
 
 
+# Longest a job status request may wait for the job to finish
+MAX_JOB_WAIT = 30.0
+
+
+def _job_response(job: Job) -> JSONResponse:
+    """202 with the job and where to poll it"""
+    return JSONResponse(
+        status_code=202,
+        content={**job.to_dict(), "status_url": f"/api/v1/jobs/{job.job_id}"},
+        headers={"Location": f"/api/v1/jobs/{job.job_id}"},
+    )
+
+
+async def _submit_job(game_id: str, kind: str, work, wait: bool):
+    """Enqueue engine work; with wait, answer with its result once done (previous synchronous behaviour)"""
+    try:
+        job = get_job_queue().submit(game_id, kind, work)
+    except GameBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    if not wait:
+        return _job_response(job)
+    await get_job_queue().wait(job)
+    if job.error:
+        raise HTTPException(status_code=400, detail=job.error)
+    return job.result
+
+
 @app.post("/api/v1/games/{game_id}/actions")
-async def process_action(game_id: str, request: PlayerActionRequest):
-    """Process human player action"""
+async def process_action(game_id: str, request: PlayerActionRequest, wait: bool = False):
+    """
+    Process human player action: validated immediately, then run as a background job
+    (202 + job_id, poll /api/v1/jobs/{job_id} for the result). wait=true answers with the result.
+    """
     game = engine.get_game(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
@@ -144,46 +241,121 @@ async def process_action(game_id: str, request: PlayerActionRequest):
         "kill": request.kill
     }
 
-    # Use async version
-    result = await engine.process_human_action_async(game_id, action)
+    error = engine.check_human_action(game_id, action)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
 
-    if "error" in result:
-        raise HTTPException(status_code=400, detail=result["error"])
-
-    return result
+    return await _submit_job(
+        game_id, "action",
+        lambda: engine.process_human_action_async(game_id, action), wait
+    )
 
 
 @app.get("/api/v1/games/{game_id}/discussions")
 async def get_discussions(game_id: str):
-    """Get discussions from cache (or generate initial discussions if empty)"""
+    """Get the discussions of the current day from cache (read-only, see POST to generate them)"""
     game = engine.get_game(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
 
-    # Get discussions from cache
-    discussions = engine.get_cached_discussions(game_id)
+    return {"discussions": engine.get_cached_discussions(game_id)}
+
 
-    # If cache is empty and in day phase, generate initial discussions
-    if not discussions and game.phase.value == 'jour':
-        discussions = await engine.generate_ai_discussion_async(game_id)
+@app.post("/api/v1/games/{game_id}/discussions")
+async def start_discussions(game_id: str, wait: bool = False):
+    """
+    Generate the first AI discussion round of the day as a background job (202 + job_id),
+    unless discussions are already cached; the job result is {"discussions": [...]}
+    """
+    game = engine.get_game(game_id)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
 
-    return {"discussions": discussions}
+    async def work() -> dict:
+        discussions = engine.get_cached_discussions(game_id)
+        if not discussions and game.phase.value == 'jour':
+            discussions = await engine.generate_ai_discussion_async(game_id)
+        return {"discussions": discussions}
+
+    return await _submit_job(game_id, "discussion", work, wait)
 
 
 @app.post("/api/v1/games/{game_id}/message")
-async def send_message(game_id: str, request: SendMessageRequest):
-    """Send human player message during discussions"""
+async def send_message(game_id: str, request: SendMessageRequest, wait: bool = False):
+    """Send human player message during discussions (background job, like actions)"""
     game = engine.get_game(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
 
-    # Use async version
-    result = await engine.send_human_message_async(game_id, request.message)
+    error = engine.check_human_message(game_id)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
 
-    if "error" in result:
-        raise HTTPException(status_code=400, detail=result["error"])
+    return await _submit_job(
+        game_id, "message",
+        lambda: engine.send_human_message_async(game_id, request.message), wait
+    )
+
+
+@app.get("/api/v1/games/{game_id}/events")
+async def get_game_events(game_id: str, upto: Optional[int] = None):
+    """
+    Event log of a game; with upto, also the state rebuilt after the first `upto` events
+    (GameStarted included). `first` is the lowest valid upto: 1, or 0 for a restored game.
+    """
+    log = engine.event_logs.get(game_id)
+    if not engine.get_game(game_id) or log is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    response = {
+        "events": [event.to_dict() for event in log.events],
+        "checkpoints": [count for count, _ in log.checkpoints],
+        "first": log.first,
+    }
+    if upto is not None:
+        try:
+            response["state"] = log.rebuild(upto).to_dict()
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return response
+
+
+@app.get("/api/v1/games/{game_id}/snapshot")
+async def get_game_snapshot(game_id: str):
+    """Binary snapshot of the whole game (MessagePack), to restore it in another process"""
+    if not engine.get_game(game_id):
+        raise HTTPException(status_code=404, detail="Game not found")
+    return Response(snapshot_game(engine, game_id), media_type="application/x-msgpack")
+
+
+@app.post("/api/v1/games/restore")
+async def restore_game_snapshot(request: Request):
+    """Restore a game from a snapshot body (replaces a game with the same ID, unless it has a job in progress)"""
+    data = await request.body()
+    try:
+        active = get_job_queue().active(snapshot_game_id(data))
+        if active:
+            raise HTTPException(status_code=409, detail=str(GameBusy(active)))
+        game = restore_game(engine, data)
+    except SnapshotError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"game_id": game.game_id, "phase": game.phase.value, "day_number": game.day_number}
 
-    return result
+
+@app.get("/api/v1/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0):
+    """Job status and, once finished, its result; wait (seconds) long-polls until it finishes"""
+    job = get_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if wait > 0 and not job.finished:
+        await get_job_queue().wait(job, min(wait, MAX_JOB_WAIT))
+    return job.to_dict()
+
+
+@app.get("/api/v1/jobs")
+async def get_jobs_stats():
+    """Job queue workers, depth and outcomes"""
+    return get_job_queue().stats()
 
 
 @app.get("/api/v1/games/{game_id}/summary")
@@ -196,43 +368,229 @@ async def get_game_summary(game_id: str, player_name: str):
 
     return result
 
+LIVE_GAMES.set_function(lambda: sum(1 for g in engine.games.values() if g.status == GameStatus.EN_COURS))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/v1/games/{game_id}/traces")
+async def get_game_traces(game_id: str):
+    """Recent engine operations of a game as a Chrome trace (chrome://tracing, Perfetto)"""
+    if not engine.get_game(game_id):
+        raise HTTPException(status_code=404, detail="Game not found")
+    return chrome_trace(traces_for_game(game_id))
+
+
+@app.get("/api/v1/games/{game_id}/usage")
+async def get_game_usage(game_id: str):
+    """LLM tokens and estimated cost of a game, per agent, call type and day (zero before its first call)"""
+    if not engine.get_game(game_id):
+        raise HTTPException(status_code=404, detail="Game not found")
+    ledger = get_usage_ledger()
+    usage = ledger.game_usage(game_id) or GameUsage(budget=ledger.default_budget or None)
+    return usage.to_dict()
+
+
+@app.get("/api/v1/llm/usage")
+async def get_llm_usage():
+    """LLM tokens and estimated cost across all games"""
+    return get_usage_ledger().stats()
+
+
+@app.get("/api/v1/llm/scheduler")
+async def get_llm_scheduler_stats():
+    """LLM scheduler budgets, queue depth and wait times"""
+    return get_llm_scheduler().stats()
+
 @app.get("/api/v1/tts/stream")
-async def tts_stream(text: str, voice_id: str = "YTpq7expH9539ERJ"):
+async def tts_stream(
+    request: Request,
+    text: str,
+    voice_id: str = "YTpq7expH9539ERJ",
+    format: Optional[str] = None,
+    sample_rate: Optional[int] = None,
+    normalize: bool = False,
+    trim_silence: bool = True
+):
     """
     Stream audio TTS for given text
     Only used during DAY phase for AI discussions
+
+    The output format is negotiated from the `format` parameter ("pcm" or "opus")
+    or the Accept header (audio/ogg); Opus is encoded incrementally per chunk.
+    Audio is trimmed, resampled and sent in fixed 80 ms frames; normalize=true also evens out its level.
     """
     if not text or not text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
 
-    print(f"[API_TTS] TTS request received for: {text[:100]}..." if len(text) > 100 else f"[API_TTS] TTS request received for: {text}")
+    api_log.debug("TTS request received for: %.100s", text)
+    # NumPy-based audio code is only loaded once TTS is actually used
+    from .audio_encoding import PCMPostProcessor, create_encoder, default_sample_rate, negotiate_format
 
     tts_service = get_tts_service()
 
     if not tts_service:
         raise HTTPException(status_code=503, detail="TTS service unavailable")
 
+    if sample_rate is not None and not 8000 <= sample_rate <= 48000:
+        raise HTTPException(status_code=400, detail="sample_rate must be between 8000 and 48000")
+
+    try:
+        audio_format = negotiate_format(request.headers.get("accept"), format)
+        output_rate = sample_rate or default_sample_rate(audio_format)
+        encoder = create_encoder(audio_format, output_rate)
+    except (ValueError, RuntimeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    post_processor = PCMPostProcessor(
+        input_rate=tts_service.sample_rate,
+        output_rate=output_rate,
+        normalize=normalize,
+        trim_silence=trim_silence
+    )
+
     try:
         async def audio_generator():
-            print(f"[API_TTS] Audio streaming started...")
+            api_log.debug("TTS streaming started (%s)", encoder.media_type)
             async for chunk in tts_service.text_to_speech_stream(text, voice_id):
-                yield chunk
-            print(f"[API_TTS] Audio streaming completed")
+                for frame in post_processor.process(chunk):
+                    encoded = encoder.encode(frame)
+                    if encoded:
+                        yield encoded
+            for frame in post_processor.flush():
+                encoded = encoder.encode(frame)
+                if encoded:
+                    yield encoded
+            tail = encoder.flush()
+            if tail:
+                yield tail
+            api_log.debug("TTS streaming completed")
 
         return StreamingResponse(
             audio_generator(),
-            media_type="audio/pcm",
-            headers={
-                "Content-Type": "audio/pcm",
-                "X-Sample-Rate": "48000",
-                "X-Channels": "1",
-                "X-Bit-Depth": "16"
-            }
+            media_type=encoder.media_type,
+            headers={**encoder.headers, "Vary": "Accept"}
         )
     except Exception as e:
-        print(f"[API_TTS] ERROR: {str(e)}")
+        api_log.exception("TTS stream failed")
         raise HTTPException(status_code=500, detail=f"TTS error: {str(e)}")
 
+
+# Frame length marking a line whose synthesis failed (ends the line, no payload)
+LINE_FAILED = 0xFFFFFFFF
+
+
+@app.get("/api/v1/games/{game_id}/tts/day")
+async def tts_day_stream(
+    game_id: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    day: Optional[int] = None,
+    sample_rate: int = 48000
+):
+    """
+    Stream the audio of a range of discussion lines over one connection
+
+    Every line is synthesized concurrently with its speaker's voice, and sent in
+    playback order as frames: a header of two little-endian uint32 (line index,
+    payload length) followed by the PCM payload. A zero-length frame ends a line;
+    a line whose synthesis failed ends with a LINE_FAILED length and no payload instead.
+    """
+    game = engine.get_game(game_id)
+    if not game:
+        raise HTTPException(status_code=404, detail="Game not found")
+    from .audio_encoding import PCMPostProcessor
+
+    tts_service = get_tts_service()
+    if not tts_service:
+        raise HTTPException(status_code=503, detail="TTS service unavailable")
+    if not 8000 <= sample_rate <= 48000:
+        raise HTTPException(status_code=400, detail="sample_rate must be between 8000 and 48000")
+    if start < 0 or (end is not None and end < start):
+        raise HTTPException(status_code=400, detail="Invalid discussion range")
+
+    if day is None or day == game.day_number:
+        discussions = engine.get_cached_discussions(game_id)
+    else:
+        discussions = game.discussions_history.get(day, [])
+    selected = discussions[start:end]
+
+    # Lines without a voice (human player) are sent as an empty line to keep indices aligned
+    lines = []
+    for discussion in selected:
+        speaker = game.get_player(discussion["player"])
+        voice_id = speaker.voice_id if speaker and not speaker.is_human else None
+        lines.append((discussion["message"] if voice_id else "", voice_id))
+
+    async def frame_generator():
+        voiced = [i for i, (text, voice_id) in enumerate(lines) if voice_id and text.strip()]
+        closed = 0  # lines fully sent so far
+        post_processor = None
+        async for position, chunk in tts_service.stream_lines([lines[i] for i in voiced]):
+            line = voiced[position]
+            # Silent lines that come before this one in playback order
+            while closed < line:
+                yield struct.pack("<II", start + closed, 0)
+                closed += 1
+            if isinstance(chunk, Exception):
+                yield struct.pack("<II", start + line, LINE_FAILED)
+                closed += 1
+                post_processor = None
+                continue
+            if post_processor is None:
+                post_processor = PCMPostProcessor(input_rate=tts_service.sample_rate, output_rate=sample_rate)
+            frames = post_processor.process(chunk) if chunk is not None else post_processor.flush()
+            for frame in frames:
+                yield struct.pack("<II", start + line, len(frame)) + frame
+            if chunk is None:
+                yield struct.pack("<II", start + line, 0)
+                closed += 1
+                post_processor = None
+        while closed < len(lines):
+            yield struct.pack("<II", start + closed, 0)
+            closed += 1
+
+    return StreamingResponse(
+        frame_generator(),
+        media_type="application/octet-stream",
+        headers={
+            "X-Frame-Header": "uint32le line_index, uint32le length (0: end of line, 0xFFFFFFFF: line failed)",
+            "X-Line-Count": str(len(lines)),
+            "X-Sample-Rate": str(sample_rate),
+            "X-Channels": "1",
+            "X-Bit-Depth": "16"
+        }
+    )
+
+
+@app.get("/api/v1/tts/cache")
+async def tts_cache_stats():
+    """TTS audio cache hit rate, bytes saved and single-flight coalescing"""
+    tts_service = get_tts_service()
+    if not tts_service:
+        raise HTTPException(status_code=503, detail="TTS service unavailable")
+    return {**tts_service.cache.stats(), "single_flight": dict(tts_service.single_flight_counts)}
+
+@app.get("/api/v1/tts/presynthesis")
+async def tts_presynthesis_stats():
+    """Background TTS pre-synthesis queue depth and synthesis-ahead margin"""
+    tts_service = get_tts_service()
+    if not tts_service:
+        raise HTTPException(status_code=503, detail="TTS service unavailable")
+    return tts_service.presynthesis_stats()
+
+
+@app.get("/api/v1/tts/pool")
+async def tts_pool_stats():
+    """Upstream TTS sessions, concurrent streams and queueing"""
+    tts_service = get_tts_service()
+    if not tts_service:
+        raise HTTPException(status_code=503, detail="TTS service unavailable")
+    return tts_service.pool.stats()
+
 def _generate_intro_message(role: Role) -> str:
     """Generate introduction message based on role"""
     messages = {
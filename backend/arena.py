@@ -0,0 +1,195 @@
+"""
+Arena: AI-only games fanned out over a process pool, without the API and without
+live LLM calls, aggregated into win rates per role and per personality
+
+    python -m backend.arena --games 1000 [--workers 8] [--backend offline|replay]
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+
+# One engine per worker process, created by _init_worker
+_engine = None
+
+
+def _init_worker():
+    global _engine
+    from .game_engine import GameEngine
+    _engine = GameEngine()
+
+
+async def _play(seed: int, settings: dict, max_turns: int) -> dict:
+    from .models import GameStatus, Role
+
+    game = _engine.create_game(None, **settings)
+    turns = 0
+    try:
+        while game.status == GameStatus.EN_COURS and turns < max_turns:
+            result = await _engine.process_human_action_async(game.game_id, {"action": game.pending_action})
+            if "error" in result:
+                raise RuntimeError(f"{game.pending_action}: {result['error']}")
+            turns += 1
+        # Let background work scheduled by the last turn (day summaries) finish inside this game's loop
+        tasks = _engine.background_tasks.get(game.game_id, set())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        _engine.discard_game(game.game_id)
+
+    winner = {
+        GameStatus.VICTOIRE_VILLAGE: "village",
+        GameStatus.VICTOIRE_LOUPS: "loups_garous",
+    }.get(game.status)
+    return {
+        "seed": seed,
+        "winner": winner,
+        "days": game.day_number,
+        "players": [
+            {
+                "personality": p.name,
+                "role": p.role.value,
+                "won": winner is not None and (p.role == Role.LOUP_GAROU) == (winner == "loups_garous"),
+                "survived": p.is_alive,
+            }
+            for p in game.players
+        ],
+    }
+
+
+def play_game(seed: int, settings: dict, max_turns: int) -> dict:
+    """One game in this worker; the global RNG is seeded so the game replays exactly"""
+    random.seed(seed)
+    return asyncio.run(_play(seed, settings, max_turns))
+
+
+def wilson_interval(wins: int, total: int, confidence: float = 0.95) -> tuple[float, float]:
+    """Wilson score interval of a win rate (sensible for small samples and rates near 0 or 1)"""
+    if total == 0:
+        return 0.0, 1.0
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = wins / total
+    centre = (rate + z * z / (2 * total)) / (1 + z * z / total)
+    margin = z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total)) / (1 + z * z / total)
+    return max(centre - margin, 0.0), min(centre + margin, 1.0)
+
+
+def aggregate(results: list[dict], confidence: float = 0.95) -> dict:
+    """Win rates per faction, role and personality, with confidence intervals"""
+    def rates(counts: dict[str, list[int]]) -> dict:
+        table = {}
+        for name, (wins, total) in sorted(counts.items()):
+            low, high = wilson_interval(wins, total, confidence)
+            table[name] = {"games": total, "wins": wins, "win_rate": wins / total, "ci_low": low, "ci_high": high}
+        return table
+
+    factions: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    roles: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    personalities: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    finished = [r for r in results if r["winner"]]
+    for result in finished:
+        for faction in ("village", "loups_garous"):
+            factions[faction][0] += result["winner"] == faction
+            factions[faction][1] += 1
+        for player in result["players"]:
+            for counts, key in ((roles, player["role"]), (personalities, player["personality"])):
+                counts[key][0] += player["won"]
+                counts[key][1] += 1
+
+    return {
+        "games": len(results),
+        "unfinished": len(results) - len(finished),
+        "confidence": confidence,
+        "mean_days": statistics.fmean(r["days"] for r in finished) if finished else None,
+        "factions": rates(factions),
+        "roles": rates(roles),
+        "personalities": rates(personalities),
+    }
+
+
+def run_arena(
+    games: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    settings: Optional[dict] = None,
+    max_turns: int = 100,
+) -> list[dict]:
+    """Play `games` games with seeds seed..seed+games-1 over a pool of worker processes"""
+    settings = settings or {}
+    # Fresh interpreters: each worker imports the engine with the environment set up by main()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker) as pool:
+        futures = [pool.submit(play_game, seed + i, settings, max_turns) for i in range(games)]
+        return [f.result() for f in futures]
+
+
+def _print_table(title: str, table: dict, confidence: float):
+    interval = f"{confidence:.0%} CI"
+    print(f"\n{title:<16}{'games':>8}{'win rate':>10}{interval:>18}")
+    for name, row in table.items():
+        ci = f"[{row['ci_low']:.3f}, {row['ci_high']:.3f}]"
+        print(f"{name:<16}{row['games']:>8}{row['win_rate']:>10.3f}{ci:>18}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--wolves", type=int, default=2)
+    parser.add_argument("--no-seer", action="store_true")
+    parser.add_argument("--no-witch", action="store_true")
+    parser.add_argument("--backend", choices=("offline", "replay"), default="offline",
+                        help="offline: heuristic fallbacks only; replay: recorded responses (LLM_REPLAY_FILE)")
+    parser.add_argument("--replay-file", help="recorded responses for --backend replay")
+    parser.add_argument("--max-turns", type=int, default=100, help="actions before a game is abandoned")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--json", help="write per-game results and the aggregate to this file")
+    args = parser.parse_args()
+
+    # Read by the workers at import time
+    os.environ["LLM_BACKEND"] = args.backend
+    if args.replay_file:
+        os.environ["LLM_REPLAY_FILE"] = args.replay_file
+    os.environ.setdefault("TRACING", "0")
+    os.environ.setdefault("TTS_PRESYNTHESIS", "0")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from .ai_players import AI_PERSONALITIES
+    if args.players > len(AI_PERSONALITIES):
+        parser.error(f"at most {len(AI_PERSONALITIES)} players (one per personality)")
+
+    settings = {
+        "num_players": args.players,
+        "num_wolves": args.wolves,
+        "include_seer": not args.no_seer,
+        "include_witch": not args.no_witch,
+    }
+    start = time.perf_counter()
+    results = run_arena(args.games, args.workers, args.seed, settings, args.max_turns)
+    elapsed = time.perf_counter() - start
+    summary = aggregate(results, args.confidence)
+
+    print(f"{summary['games']} games in {elapsed:.1f}s ({summary['games'] / elapsed:.1f} games/s), "
+          f"{summary['unfinished']} unfinished, {summary['mean_days'] or 0:.2f} days on average")
+    _print_table("Faction", summary["factions"], args.confidence)
+    _print_table("Role", summary["roles"], args.confidence)
+    _print_table("Personality", summary["personalities"], args.confidence)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "summary": summary, "games": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
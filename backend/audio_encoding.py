@@ -0,0 +1,293 @@
+"""
+PCM post-processing and incremental audio encoders for the TTS streaming endpoint
+"""
+import importlib.util
+import io
+from typing import Optional
+
+import numpy as np
+
+# PyAV is optional and slow to import: only loaded by the Opus encoder
+AV_AVAILABLE = importlib.util.find_spec("av") is not None
+
+
+SOURCE_SAMPLE_RATE = 48000
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object collecting what the muxer produced since the last drain"""
+
+    def __init__(self):
+        self.parts: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+class PCMPostProcessor:
+    """
+    Streaming post-processing of PCM int16 mono audio, vectorized with NumPy:
+    leading/trailing silence trimming, optional peak normalization, resampling,
+    and re-chunking into fixed-size frames.
+
+    Normalization follows a peak envelope (instant attack, exponential release)
+    and ramps the gain between chunks, so loud syllables never cause level jumps.
+    """
+
+    def __init__(
+        self,
+        input_rate: int = 48000,
+        output_rate: int = 48000,
+        frame_ms: int = 80,
+        normalize: bool = False,
+        trim_silence: bool = True,
+        silence_threshold: int = 500,
+        target_peak: float = 0.89,
+        max_gain: float = 4.0,
+        attack_ms: float = 5.0,
+        release_ms: float = 500.0,
+        tail_padding_ms: int = 40
+    ):
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.frame_bytes = output_rate * frame_ms // 1000 * 2
+        self.normalize = normalize
+        self.trim_silence = trim_silence
+        self.silence_threshold = silence_threshold
+        self.target_peak = target_peak * 32767
+        self.max_gain = max_gain
+        self.attack = max(int(input_rate * attack_ms / 1000), 1)
+        self.release = input_rate * release_ms / 1000
+        self.tail_padding = input_rate * tail_padding_ms // 1000
+
+        self._odd_byte = b''
+        self._started = not trim_silence  # leading silence already skipped
+        self._held = np.zeros(0, dtype=np.int16)  # trailing silence, emitted only if speech follows
+        self._envelope = 0.0
+        self._gain: Optional[float] = None  # gain reached at the end of the previous chunk
+        # Integer ratios (48k -> 24k/16k/12k/8k) use block averaging, others linear interpolation
+        self._factor = input_rate // output_rate if input_rate % output_rate == 0 else None
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._position = 0.0
+        self._out = bytearray()
+
+    def process(self, chunk: bytes) -> list[bytes]:
+        """Feed raw PCM bytes, return the complete frames now available"""
+        data = self._odd_byte + chunk
+        usable = len(data) - len(data) % 2
+        self._odd_byte = data[usable:]
+        samples = np.frombuffer(data, dtype=np.int16, count=usable // 2)
+        self._emit(self._trim(samples))
+        return self._frames()
+
+    def flush(self) -> list[bytes]:
+        """End of stream: keep a short tail of the held silence and pad the last frame"""
+        self._emit(self._held[:self.tail_padding])
+        self._held = np.zeros(0, dtype=np.int16)
+        if self._factor is None and self._carry.size:
+            self._out += self._carry[-1:].astype(np.int16).tobytes()
+        self._carry = np.zeros(0, dtype=np.float32)
+        if self._out:
+            self._out += bytes(-len(self._out) % self.frame_bytes)
+        return self._frames()
+
+    def _trim(self, samples: np.ndarray) -> np.ndarray:
+        if not self.trim_silence or samples.size == 0:
+            return samples
+        loud = np.abs(samples.astype(np.int32)) > self.silence_threshold
+        if not self._started:
+            if not loud.any():
+                return samples[:0]
+            first = int(np.argmax(loud))
+            samples, loud = samples[first:], loud[first:]
+            self._started = True
+        # Hold back the trailing silent run until we know whether speech follows
+        samples = np.concatenate((self._held, samples))
+        loud = np.concatenate((np.zeros(self._held.size, dtype=bool), loud))
+        if not loud.any():
+            self._held = samples
+            return samples[:0]
+        last = loud.size - int(np.argmax(loud[::-1]))
+        self._held = samples[last:]
+        return samples[:last]
+
+    def _emit(self, samples: np.ndarray):
+        if samples.size == 0:
+            return
+        x = samples.astype(np.float32)
+        if self.normalize:
+            x *= self._gain_ramp(x)
+        x = self._resample(x)
+        self._out += np.clip(np.rint(x), -32768, 32767).astype(np.int16).tobytes()
+
+    def _gain_ramp(self, x: np.ndarray) -> np.ndarray:
+        """
+        Per-sample gain for a chunk. A falling gain reaches its target within attack_ms,
+        and before the first sample that would overshoot (the chunk is the look-ahead);
+        a rising gain ramps over the whole chunk.
+        """
+        decay = np.exp(-x.size / self.release)
+        self._envelope = max(float(np.abs(x).max()), self._envelope * decay)
+        if self._envelope <= 0:
+            return np.float32(self._gain or 1.0)
+        target = min(self.max_gain, self.target_peak / self._envelope)
+        previous = target if self._gain is None else self._gain
+        self._gain = target
+        ramp = np.full(x.size, target, dtype=np.float32)
+        if target < previous:
+            over = np.abs(x) * previous > self.target_peak
+            length = min(self.attack, int(np.argmax(over)) if over.any() else x.size)
+        else:
+            length = x.size
+        ramp[:length] = np.linspace(previous, target, length, endpoint=False, dtype=np.float32)
+        return ramp
+
+    def _resample(self, x: np.ndarray) -> np.ndarray:
+        if self.output_rate == self.input_rate:
+            return x
+        buf = np.concatenate((self._carry, x))
+        if self._factor:
+            usable = buf.size - buf.size % self._factor
+            self._carry = buf[usable:]
+            return buf[:usable].reshape(-1, self._factor).mean(axis=1)
+        # Linear interpolation, the last input sample is carried over to the next chunk
+        step = self.input_rate / self.output_rate
+        last = buf.size - 1
+        if last <= self._position:
+            self._position -= last
+            self._carry = buf[-1:]
+            return np.zeros(0, dtype=np.float32)
+        positions = self._position + step * np.arange(int(np.ceil((last - self._position) / step)))
+        out = np.interp(positions, np.arange(buf.size), buf)
+        self._position = positions[-1] + step - last
+        self._carry = buf[-1:]
+        return out.astype(np.float32)
+
+    def _frames(self) -> list[bytes]:
+        count = len(self._out) // self.frame_bytes
+        frames = [bytes(self._out[i * self.frame_bytes:(i + 1) * self.frame_bytes]) for i in range(count)]
+        del self._out[:count * self.frame_bytes]
+        return frames
+
+
+class PCMEncoder:
+    """Raw PCM int16 mono passthrough"""
+
+    media_type = "audio/pcm"
+
+    def __init__(self, sample_rate: int = SOURCE_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+
+    @property
+    def headers(self) -> dict:
+        return {
+            "Content-Type": self.media_type,
+            "X-Sample-Rate": str(self.sample_rate),
+            "X-Channels": "1",
+            "X-Bit-Depth": "16"
+        }
+
+    def encode(self, pcm: bytes) -> bytes:
+        return pcm
+
+    def flush(self) -> bytes:
+        return b''
+
+
+class OggOpusEncoder:
+    """
+    Ogg/Opus encoder fed chunk by chunk; each call returns the pages completed so far.
+    Input PCM must already be at sample_rate (see PCMPostProcessor).
+    """
+
+    media_type = "audio/ogg"
+
+    def __init__(self, sample_rate: int = 24000, bitrate: int = 24000):
+        if not AV_AVAILABLE:
+            raise RuntimeError("PyAV is not installed, Opus encoding unavailable")
+        import av
+        if sample_rate not in OPUS_SAMPLE_RATES:
+            raise ValueError(f"Opus sample rate must be one of {OPUS_SAMPLE_RATES}")
+        self.sample_rate = sample_rate
+        self._sink = _ChunkSink()
+        # Short Ogg pages so the client receives audio as it is encoded
+        self._container = av.open(
+            self._sink, mode="w", format="ogg",
+            options={"page_duration": "80000"}, buffer_size=4096
+        )
+        self._stream = self._container.add_stream("libopus", rate=sample_rate)
+        self._stream.bit_rate = bitrate
+        self._stream.layout = "mono"
+        self._remainder = b''
+
+    @property
+    def headers(self) -> dict:
+        return {
+            "Content-Type": self.media_type,
+            "X-Sample-Rate": str(self.sample_rate),
+            "X-Channels": "1"
+        }
+
+    def _mux(self, frames):
+        for frame in frames:
+            for packet in self._stream.encode(frame):
+                self._container.mux(packet)
+
+    def encode(self, pcm: bytes) -> bytes:
+        data = self._remainder + pcm
+        usable = len(data) - len(data) % 2
+        self._remainder = data[usable:]
+        frame = _to_frame(data[:usable], self.sample_rate)
+        if frame is not None:
+            self._mux([frame])
+        return self._sink.drain()
+
+    def flush(self) -> bytes:
+        self._mux([None])
+        self._container.close()
+        return self._sink.drain()
+
+
+def _to_frame(pcm: bytes, sample_rate: int):
+    """Wrap int16 samples in an AudioFrame (None if there are none)"""
+    import av
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    if samples.size == 0:
+        return None
+    frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format="s16", layout="mono")
+    frame.sample_rate = sample_rate
+    return frame
+
+
+def negotiate_format(accept: Optional[str], requested: Optional[str]) -> str:
+    """Pick "opus" or "pcm" from an explicit format parameter, else the Accept header"""
+    if requested:
+        return requested.lower()
+    accept = (accept or "").lower()
+    if AV_AVAILABLE and ("audio/ogg" in accept or "audio/opus" in accept):
+        return "opus"
+    return "pcm"
+
+
+def default_sample_rate(audio_format: str) -> int:
+    """Output rate used when the client does not request one"""
+    return 24000 if audio_format == "opus" else SOURCE_SAMPLE_RATE
+
+
+def create_encoder(audio_format: str, sample_rate: int):
+    """Encoder for a negotiated format, fed PCM already at sample_rate"""
+    if audio_format == "opus":
+        return OggOpusEncoder(sample_rate=sample_rate)
+    if audio_format == "pcm":
+        return PCMEncoder(sample_rate=sample_rate)
+    raise ValueError(f"Unsupported audio format: {audio_format}")
@@ -2,6 +2,7 @@
 Moteur de jeu du Loup-Garou avec agents IA OpenAI
 """
 import asyncio
+import os
 import random
 from typing import Optional
 from collections import Counter
@@ -9,10 +10,40 @@ import json
 import re
 
 from .models import (
-    GameState, Player, Role, Phase, GameStatus,
-    WitchPotions, NightActions, VoteResult
+    GameState, Player, Role, Phase, GameStatus, VoteResult
+)
+from .game_events import (
+    DiscussionEntry, EventLog, GameEnded, GameEvent, GameStarted, NightEnded, PendingActionChanged,
+    PhaseChanged, PlayerKilled, PotionUsed, SeerDiscovery, VotesTallied, WolfVictimChosen,
+    apply_event, start_state
 )
 from .ai_players import AIAgent, AIPersonality, assign_personalities, AI_PERSONALITIES
+from .night_scheduler import NightNode, NodeHook, run_night_dag
+from .llm_scheduler import Priority, get_llm_scheduler, llm_priority
+from .llm_deadlines import TURN_DEADLINE, llm_deadline
+from .llm_usage import get_usage_ledger
+from .metrics import ACTION_SECONDS, DISCUSSION_ROUND_SECONDS
+from .log import get_logger
+from .tracing import detached, span, traced
+from .snapshots import get_snapshot_store
+from .tts_services import get_tts_service
+
+
+night_log = get_logger("night")
+day_log = get_logger("day")
+discussion_log = get_logger("discussion")
+
+
+def _game_span_attributes(self, game: GameState, *args, **kwargs) -> dict:
+    """Attributs de trace des méthodes du moteur qui reçoivent la partie"""
+    return {"game_id": game.game_id, "day": game.day_number}
+
+
+# Actions mesurées individuellement (les autres sont regroupées sous "other")
+METRIC_ACTIONS = {
+    "auto_night", "wolf_vote", "seer_check", "witch_choice", "wait_night",
+    "auto_day", "day_vote", "skip_day_vote"
+}
 
 
 class GameEngine:
@@ -24,16 +55,24 @@ class GameEngine:
         self.personalities: dict[str, dict[str, AIPersonality]] = {}
         self.discussions_cache: dict[str, list[dict]] = {}  # game_id -> discussions
         self.discussion_state: dict[str, dict] = {}  # game_id -> {order: list, current_index: int, completed: bool}
+        self.background_tasks: dict[str, set[asyncio.Task]] = {}  # game_id -> tâches de fond en cours
+        self.speculative_night: dict[str, dict] = {}  # game_id -> {day: int, tasks: {(kind, player_name) -> Task}}
+        self.night_node_hooks: list[NodeHook] = []  # appelés avec (nœud, durée, erreur) à la fin de chaque nœud nocturne
+        self.event_logs: dict[str, EventLog] = {}  # game_id -> journal des événements de la partie
 
     def create_game(
         self,
-        human_name: str,
+        human_name: Optional[str],
         num_players: int = 6,
         num_wolves: int = 2,
         include_seer: bool = True,
-        include_witch: bool = True
+        include_witch: bool = True,
+        token_budget: Optional[int] = None
     ) -> GameState:
-        """Crée une nouvelle partie"""
+        """
+        Crée une nouvelle partie (token_budget : budget LLM propre à la partie, sinon celui par défaut).
+        Sans human_name, tous les joueurs sont des IA (arène) et la partie avance par auto_night / auto_day.
+        """
         game_id = GameState.generate_id()
 
         # Créer la liste des rôles
@@ -52,12 +91,14 @@ class GameEngine:
 
         # Créer les joueurs
         players = []
-        human_role = roles.pop()
-        players.append(Player(
-            name=human_name,
-            role=human_role,
-            is_human=True
-        ))
+        human_role = None
+        if human_name is not None:
+            human_role = roles.pop()
+            players.append(Player(
+                name=human_name,
+                role=human_role,
+                is_human=True
+            ))
 
         # Créer les joueurs IA
         for role in roles:
@@ -70,32 +111,31 @@ class GameEngine:
         # Assigner les personnalités (renomme les joueurs IA)
         self.personalities[game_id] = assign_personalities(players)
 
-        # Créer l'état du jeu
-        game = GameState(
+        # Créer l'état du jeu (premier événement du journal)
+        started = GameStarted(
             game_id=game_id,
-            players=players,
-            phase=Phase.NUIT,
-            day_number=1,
-            status=GameStatus.EN_COURS,
-            witch_potions=WitchPotions(),
-            night_actions=NightActions(),
-            history=[],
+            players=[
+                {
+                    "name": p.name, "role": p.role.value, "is_human": p.is_human,
+                    "personality": p.personality, "voice_id": p.voice_id
+                }
+                for p in players
+            ],
             pending_action=self._get_pending_action(players, Phase.NUIT, human_role)
         )
+        game = start_state(started)
+        self.event_logs[game_id] = EventLog([started])
 
         self.games[game_id] = game
         self.discussions_cache[game_id] = []
+        if token_budget is not None:
+            get_usage_ledger().set_budget(game_id, token_budget)
 
         # Créer les agents IA
         self._init_ai_agents(game)
 
-        # Log de création
-        game.history.append({
-            "type": "game_start",
-            "day": 1,
-            "players": [p.name for p in players],
-            "human_role": human_role.display_name
-        })
+        # Anticiper les décisions nocturnes des IA qui ne dépendent pas de l'humain
+        self._start_speculative_night(game)
 
         return game
 
@@ -110,7 +150,7 @@ class GameEngine:
                         player, personality, game
                     )
 
-    def _get_pending_action(self, players: list[Player], phase: Phase, human_role: Role) -> Optional[str]:
+    def _get_pending_action(self, players: list[Player], phase: Phase, human_role: Optional[Role]) -> Optional[str]:
         """Détermine l'action en attente pour le joueur humain"""
         human = next((p for p in players if p.is_human), None)
 
@@ -137,26 +177,77 @@ class GameEngine:
         """Récupère une partie par son ID"""
         return self.games.get(game_id)
 
-    async def process_human_action_async(self, game_id: str, action: dict) -> dict:
-        """Traite une action du joueur humain (version async)"""
+    def _emit(self, game: GameState, event: GameEvent):
+        """Applique un événement à la partie et l'ajoute à son journal"""
+        apply_event(game, event)
+        self.event_logs[game.game_id].append(event, game)
+
+    def start_event_log(self, game: GameState):
+        """Nouveau journal partant de l'état courant de la partie (instantané restauré sans journal)"""
+        self.event_logs[game.game_id] = EventLog.starting_from(game)
+
+    def _end_game(self, game: GameState, victory: GameStatus) -> dict:
+        """Enregistre la fin de partie et renvoie le bloc game_over de la réponse"""
+        self._emit(game, GameEnded(victory.value))
+        return {
+            "winner": "Village" if victory == GameStatus.VICTOIRE_VILLAGE else "Loups-Garous",
+            "status": victory.value
+        }
+
+    def discard_game(self, game_id: str):
+        """Retire une partie du moteur (et sa consommation du registre) et annule ses tâches de fond"""
+        self._discard_speculative_night(game_id)
+        for task in self.background_tasks.pop(game_id, set()):
+            task.cancel()
+        for per_game in (
+            self.games, self.ai_agents, self.personalities, self.discussions_cache,
+            self.discussion_state, self.event_logs
+        ):
+            per_game.pop(game_id, None)
+        get_usage_ledger().drop(game_id)
+
+    def check_human_action(self, game_id: str, action: dict) -> Optional[str]:
+        """Vérifications préalables d'une action humaine (message d'erreur, ou None si elle peut être traitée)"""
         game = self.get_game(game_id)
         if not game:
-            return {"error": "Partie non trouvée"}
+            return "Partie non trouvée"
 
         if game.status != GameStatus.EN_COURS:
-            return {"error": "La partie est terminée"}
+            return "La partie est terminée"
 
         human = next((p for p in game.players if p.is_human), None)
 
-        # Permettre les actions automatiques même si le joueur est mort
+        # Permettre les actions automatiques même si le joueur est mort (ou absent, dans l'arène)
         auto_actions = {"skip_day_vote", "auto_night", "auto_day"}
-        if not human or (not human.is_alive and action.get("action") not in auto_actions):
-            return {"error": "Vous êtes mort"}
+        if not human:
+            return None if action.get("action") in {"auto_night", "auto_day"} else "Aucun joueur humain dans cette partie"
+        if not human.is_alive and action.get("action") not in auto_actions:
+            return "Vous êtes mort"
+        return None
 
-        if game.phase == Phase.NUIT:
-            return await self._process_night_action_async(game, human, action)
-        else:
-            return await self._process_day_action_async(game, human, action)
+    async def process_human_action_async(self, game_id: str, action: dict) -> dict:
+        """Traite une action du joueur humain (version async)"""
+        error = self.check_human_action(game_id, action)
+        if error:
+            return {"error": error}
+        game = self.get_game(game_id)
+        human = next((p for p in game.players if p.is_human), None)
+
+        action_label = action.get("action") if action.get("action") in METRIC_ACTIONS else "other"
+        # Chaque appel LLM de l'opération hérite de cette échéance (repli heuristique au-delà)
+        boundary = (game.phase, game.day_number, game.status)
+        with span("action", game_id=game_id, day=game.day_number, action=action_label, phase=game.phase.value), \
+                ACTION_SECONDS.time(action=action_label), llm_deadline(TURN_DEADLINE):
+            if game.phase == Phase.NUIT:
+                result = await self._process_night_action_async(game, human, action)
+            else:
+                result = await self._process_day_action_async(game, human, action)
+
+        # Instantané à chaque changement de phase (SNAPSHOT_DIR)
+        store = get_snapshot_store()
+        if store and (game.phase, game.day_number, game.status) != boundary:
+            await store.save_async(self, game_id)
+        return result
 
     def process_human_action(self, game_id: str, action: dict) -> dict:
         """Traite une action du joueur humain (wrapper sync)"""
@@ -164,22 +255,23 @@ class GameEngine:
             self.process_human_action_async(game_id, action)
         )
 
-    async def _process_night_action_async(self, game: GameState, human: Player, action: dict) -> dict:
-        """Traite une action nocturne"""
+    async def _process_night_action_async(self, game: GameState, human: Optional[Player], action: dict) -> dict:
+        """Traite une action nocturne (human est None dans une partie sans humain)"""
         action_type = action.get("action")
         result = {"success": True, "messages": [], "wolf_discussions": []}
-        print(f"\n[NIGHT_LOG] === DÉBUT traitement action nocturne: {action_type} pour {human.name} (jour {game.day_number}) ===")
+        human_name = human.name if human else "(sans humain)"
+        night_log.info("=== DÉBUT traitement action nocturne: %s pour %s (jour %s) ===", action_type, human_name, game.day_number, extra={"game_id": game.game_id})
 
         # Automatiser la nuit si le joueur est mort
         if action_type == "auto_night":
-            print(f"[NIGHT_LOG] {human.name} est mort, automatisation complète de la nuit")
+            night_log.info("%s est mort, automatisation complète de la nuit", human_name)
             result["messages"].append("Le joueur est mort. Les IA agissent automatiquement...")
             # Les IA exécutent leurs actions
             await self._execute_ai_night_actions_async(game)
-            print(f"[NIGHT_LOG] Actions IA terminées, résolution de la nuit...")
+            night_log.info("Actions IA terminées, résolution de la nuit...")
             night_result = self._resolve_night(game)
             result["night_events"] = night_result
-            print(f"[NIGHT_LOG] Nuit résolue. Événements: {night_result}")
+            night_log.debug("Nuit résolue. Événements: %s", night_result)
 
             # Mettre à jour la mémoire des agents avec les morts
             for death in night_result.get("deaths", []):
@@ -189,96 +281,85 @@ class GameEngine:
             # Vérifier la victoire
             victory = game.check_victory()
             if victory:
-                game.status = victory
-                result["game_over"] = {
-                    "winner": "Village" if victory == GameStatus.VICTOIRE_VILLAGE else "Loups-Garous",
-                    "status": victory.value
-                }
-                print(f"[NIGHT_LOG] FIN DE PARTIE: {result['game_over']['winner']} gagne")
+                result["game_over"] = self._end_game(game, victory)
+                night_log.info("FIN DE PARTIE: %s gagne", result['game_over']['winner'], extra={"game_id": game.game_id})
             else:
                 # Passer au jour
-                game.phase = Phase.JOUR
-                game.pending_action = "auto_day"
-                print(f"[NIGHT_LOG] Passage au jour {game.day_number}")
-                # Sauvegarder et réinitialiser le cache des discussions
-                self._save_discussions_history(game)
+                self._emit(game, PhaseChanged(Phase.JOUR.value, game.day_number, "auto_day"))
+                night_log.info("Passage au jour %s", game.day_number)
+                # Réinitialiser le cache des discussions (l'historique est tenu par les événements)
                 self.discussions_cache[game.game_id] = []
 
-            print(f"[NIGHT_LOG] === FIN traitement auto_night ===\n")
+            night_log.debug("=== FIN traitement auto_night ===")
             return result
 
         if human.role == Role.LOUP_GAROU and action_type == "wolf_vote":
             target_name = action.get("target")
             target = game.get_player(target_name)
-            print(f"[NIGHT_LOG] Loup humain {human.name} vote pour {target_name}")
+            night_log.info("Loup humain %s vote pour %s", human.name, target_name)
 
             if not target or not target.is_alive:
-                print(f"[NIGHT_LOG] ERREUR: Cible invalide {target_name}")
+                night_log.warning("Cible invalide %s", target_name)
                 return {"error": "Cible invalide"}
             if target.role == Role.LOUP_GAROU:
-                print(f"[NIGHT_LOG] ERREUR: {target_name} est un loup")
+                night_log.warning("%s est un loup", target_name)
                 return {"error": "Vous ne pouvez pas attaquer un autre loup"}
 
             # Générer les discussions des autres loups IA
-            print(f"[NIGHT_LOG] Génération des discussions des loups IA...")
+            night_log.info("Génération des discussions des loups IA...")
             wolf_discussions = await self._generate_wolf_discussions(game, target_name)
             result["wolf_discussions"] = wolf_discussions
-            print(f"[NIGHT_LOG] Discussions des loups générées: {len(wolf_discussions)} messages")
+            night_log.info("Discussions des loups générées: %s messages", len(wolf_discussions))
 
-            game.night_actions.wolf_victim = target_name
+            self._emit(game, WolfVictimChosen(target_name))
             result["messages"].append(f"Les loups ont choisi {target_name} comme victime.")
 
         elif human.role == Role.VOYANTE and action_type == "seer_check":
             target_name = action.get("target")
             target = game.get_player(target_name)
-            print(f"[NIGHT_LOG] Voyante humaine {human.name} scrute {target_name}")
+            night_log.info("Voyante humaine %s scrute %s", human.name, target_name)
 
             if not target or not target.is_alive:
-                print(f"[NIGHT_LOG] ERREUR: Cible invalide {target_name}")
+                night_log.warning("Cible invalide %s", target_name)
                 return {"error": "Cible invalide"}
 
-            game.night_actions.seer_target = target_name
-            game.night_actions.seer_result = target.role.display_name
-            # Ajouter à la liste des découvertes permanentes de la voyante
-            game.seer_discoveries[target_name] = target.role.display_name
+            self._emit(game, SeerDiscovery(target_name, target.role.display_name))
             result["messages"].append(f"Vous découvrez que {target_name} est {target.role.display_name}.")
             result["seer_result"] = {
                 "target": target_name,
                 "role": target.role.display_name,
                 "is_wolf": target.role == Role.LOUP_GAROU
             }
-            print(f"[NIGHT_LOG] Résultat: {target_name} est {target.role.display_name}")
+            night_log.info("Résultat: %s est %s", target_name, target.role.display_name)
 
         elif human.role == Role.SORCIERE and action_type == "witch_choice":
-            print(f"[NIGHT_LOG] Sorcière humaine {human.name} fait ses choix")
+            night_log.info("Sorcière humaine %s fait ses choix", human.name)
             if action.get("save") and game.witch_potions.has_life_potion:
-                game.night_actions.witch_save = True
-                game.witch_potions.has_life_potion = False
+                self._emit(game, PotionUsed("life", game.night_actions.wolf_victim))
                 result["messages"].append("Vous utilisez votre potion de vie.")
-                print(f"[NIGHT_LOG] Sorcière sauve {game.night_actions.wolf_victim}")
+                night_log.info("Sorcière sauve %s", game.night_actions.wolf_victim)
 
             if action.get("kill"):
                 kill_target = action.get("kill")
                 target = game.get_player(kill_target)
                 if target and target.is_alive and game.witch_potions.has_death_potion:
-                    game.night_actions.witch_kill = kill_target
-                    game.witch_potions.has_death_potion = False
+                    self._emit(game, PotionUsed("death", kill_target))
                     result["messages"].append(f"Vous utilisez votre potion de mort sur {kill_target}.")
-                    print(f"[NIGHT_LOG] Sorcière tue {kill_target}")
+                    night_log.info("Sorcière tue %s", kill_target)
 
         elif action_type == "wait_night":
-            print(f"[NIGHT_LOG] {human.name} attend que la nuit passe...")
+            night_log.info("%s attend que la nuit passe...", human.name)
             result["messages"].append("Vous attendez que la nuit passe...")
 
         # Exécuter les actions IA ET ATTENDRE QUE TOUS LES APPELS API SOIENT TERMINÉS
-        print(f"[NIGHT_LOG] Avant actions IA - état nuit: wolf_victim={game.night_actions.wolf_victim}, seer_target={game.night_actions.seer_target}, witch_save={game.night_actions.witch_save}, witch_kill={game.night_actions.witch_kill}")
+        night_log.debug("Avant actions IA - état nuit: wolf_victim=%s, seer_target=%s, witch_save=%s, witch_kill=%s", game.night_actions.wolf_victim, game.night_actions.seer_target, game.night_actions.witch_save, game.night_actions.witch_kill)
         await self._execute_ai_night_actions_async(game)
-        print(f"[NIGHT_LOG] Après actions IA - état nuit: wolf_victim={game.night_actions.wolf_victim}, seer_target={game.night_actions.seer_target}, witch_save={game.night_actions.witch_save}, witch_kill={game.night_actions.witch_kill}")
+        night_log.debug("Après actions IA - état nuit: wolf_victim=%s, seer_target=%s, witch_save=%s, witch_kill=%s", game.night_actions.wolf_victim, game.night_actions.seer_target, game.night_actions.witch_save, game.night_actions.witch_kill)
 
         # Si la Sorcière est humaine et n'a pas encore choisi, l'arrêter ici et lui montrer la victime
         witch = next((p for p in game.players if p.role == Role.SORCIERE and p.is_alive and p.is_human), None)
         if witch and action_type != "witch_choice":
-            print(f"[NIGHT_LOG] Sorcière humaine n'a pas encore choisi, mise en attente")
+            night_log.info("Sorcière humaine n'a pas encore choisi, mise en attente")
             # Afficher qui s'est fait manger
             if game.night_actions.wolf_victim:
                 victim = game.get_player(game.night_actions.wolf_victim)
@@ -287,14 +368,14 @@ class GameEngine:
                     result["witch_victim"] = game.night_actions.wolf_victim
 
             # Mettre l'action en attente pour la Sorcière
-            game.pending_action = "witch_choice"
-            print(f"[NIGHT_LOG] === FIN traitement (witch_choice en attente) ===\n")
+            self._emit(game, PendingActionChanged("witch_choice"))
+            night_log.debug("=== FIN traitement (witch_choice en attente) ===")
             return result
 
-        print(f"[NIGHT_LOG] Résolution de la nuit...")
+        night_log.info("Résolution de la nuit...")
         night_result = self._resolve_night(game)
         result["night_events"] = night_result
-        print(f"[NIGHT_LOG] Nuit résolue. Événements: {night_result}")
+        night_log.debug("Nuit résolue. Événements: %s", night_result)
 
         # Mettre à jour la mémoire des agents avec les morts
         for death in night_result.get("deaths", []):
@@ -304,145 +385,243 @@ class GameEngine:
         # Vérifier la victoire
         victory = game.check_victory()
         if victory:
-            game.status = victory
-            result["game_over"] = {
-                "winner": "Village" if victory == GameStatus.VICTOIRE_VILLAGE else "Loups-Garous",
-                "status": victory.value
-            }
-            print(f"[NIGHT_LOG] FIN DE PARTIE: {result['game_over']['winner']} gagne")
+            result["game_over"] = self._end_game(game, victory)
+            night_log.info("FIN DE PARTIE: %s gagne", result['game_over']['winner'], extra={"game_id": game.game_id})
         else:
             # Passer au jour
-            game.phase = Phase.JOUR
             # Toujours mettre pending_action à day_vote (mort ou vivant)
             # Le frontend déterminera si le joueur peut voter ou doit passer son tour
-            game.pending_action = "day_vote"
-            print(f"[NIGHT_LOG] Passage au jour {game.day_number}")
-            # Sauvegarder et réinitialiser le cache des discussions
-            self._save_discussions_history(game)
+            self._emit(game, PhaseChanged(Phase.JOUR.value, game.day_number, "day_vote"))
+            night_log.info("Passage au jour %s", game.day_number)
+            # Réinitialiser le cache des discussions (l'historique est tenu par les événements)
             self.discussions_cache[game.game_id] = []
 
-        print(f"[NIGHT_LOG] === FIN traitement {action_type} ===\n")
+        night_log.debug("=== FIN traitement %s ===", action_type)
         return result
 
+    def _start_speculative_night(self, game: GameState):
+        """Lance en arrière-plan les choix nocturnes IA indépendants de l'action humaine"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Pas de boucle active (appel sync), pas de spéculation
+
+        self._discard_speculative_night(game.game_id)
+        agents = self.ai_agents.get(game.game_id, {})
+        tasks = {}
+
+        # Les tâches créées dans ce bloc héritent de la priorité spéculative et d'une échéance propre,
+        # et ont leurs propres traces (elles survivent à l'action qui les lance)
+        with llm_priority(Priority.SPECULATIVE), llm_deadline(TURN_DEADLINE, inherit=False), detached():
+            # Préférences des loups IA : le prompt ne dépend pas du choix du loup humain
+            for player in game.get_wolves():
+                if not player.is_human and player.is_alive:
+                    agent = agents.get(player.name)
+                    if agent:
+                        fellow_wolves = [p.name for p in game.get_wolves() if p.name != player.name]
+                        tasks[("wolf_vote", player.name)] = asyncio.create_task(agent.generate_wolf_vote(fellow_wolves))
+
+            # Cible de la voyante IA
+            seer = next((p for p in game.players if p.role == Role.VOYANTE and p.is_alive and not p.is_human), None)
+            if seer and seer.name in agents:
+                tasks[("seer", seer.name)] = asyncio.create_task(agents[seer.name].generate_seer_choice())
+
+        if tasks:
+            self.speculative_night[game.game_id] = {"day": game.day_number, "tasks": tasks}
+            night_log.info("%s décisions nocturnes IA lancées par anticipation (nuit %s)", len(tasks), game.day_number)
+
+    def _take_speculative(self, game: GameState, kind: str, player_name: str) -> Optional[asyncio.Task]:
+        """Récupère (et retire) une décision anticipée pour la nuit courante, si elle existe"""
+        spec = self.speculative_night.get(game.game_id)
+        if not spec or spec["day"] != game.day_number:
+            return None
+        task = spec["tasks"].pop((kind, player_name), None)
+        if task and task.cancelled():
+            return None
+        if task:
+            # L'humain attend désormais ce résultat : passer devant les autres appels spéculatifs
+            get_llm_scheduler().promote(game.game_id, Priority.SPECULATIVE)
+        return task
+
+    def _discard_speculative_night(self, game_id: str):
+        """Annule les décisions anticipées non consommées"""
+        spec = self.speculative_night.pop(game_id, None)
+        if not spec:
+            return
+        for task in spec["tasks"].values():
+            task.cancel()
+
     async def _generate_wolf_discussions(self, game: GameState, human_target: str) -> list[dict]:
         """Génère les réponses des autres loups IA au choix de l'humain"""
-        discussions = []
         agents = self.ai_agents.get(game.game_id, {})
+        wolves = []
+        vote_tasks = []
 
         for player in game.get_wolves():
             if not player.is_human and player.is_alive:
                 agent = agents.get(player.name)
                 if agent:
                     fellow_wolves = [p.name for p in game.get_wolves() if p.name != player.name]
-                    # Générer une réaction au choix
-                    try:
-                        vote_result = await agent.generate_wolf_vote(fellow_wolves)
-                        message = f"Je suis d'accord pour {human_target}." if vote_result.get("target") == human_target else f"Je préférerais {vote_result.get('target')}, mais je te suis."
-                        discussions.append({
-                            "player": player.name,
-                            "message": message,
-                            "vote": vote_result.get("target")
-                        })
-                    except Exception:
-                        discussions.append({
-                            "player": player.name,
-                            "message": "D'accord, allons-y.",
-                            "vote": human_target
-                        })
+                    wolves.append(player.name)
+                    vote_tasks.append(
+                        self._take_speculative(game, "wolf_vote", player.name)
+                        or agent.generate_wolf_vote(fellow_wolves)
+                    )
+
+        # Tous les loups IA réagissent en parallèle
+        vote_results = await asyncio.gather(*vote_tasks, return_exceptions=True)
+
+        discussions = []
+        for wolf_name, vote_result in zip(wolves, vote_results):
+            if isinstance(vote_result, Exception):
+                discussions.append({
+                    "player": wolf_name,
+                    "message": "D'accord, allons-y.",
+                    "vote": human_target
+                })
+                continue
+            message = f"Je suis d'accord pour {human_target}." if vote_result.get("target") == human_target else f"Je préférerais {vote_result.get('target')}, mais je te suis."
+            discussions.append({
+                "player": wolf_name,
+                "message": message,
+                "vote": vote_result.get("target")
+            })
 
         return discussions
 
+    @traced("night.ai_actions", _game_span_attributes)
     async def _execute_ai_night_actions_async(self, game: GameState):
-        """Exécute les actions nocturnes des IA (loups et voyante seulement)"""
-        print(f"\n[NIGHT_LOG] === Exécution des actions nocturnes IA pour le jour {game.day_number} ===")
+        """
+        Exécute les actions nocturnes des IA sous forme de graphe de dépendances :
+        les loups et la voyante décident en parallèle, la sorcière attend la victime des loups
+        """
+        night_log.info("=== Exécution des actions nocturnes IA pour le jour %s ===", game.day_number)
         agents = self.ai_agents.get(game.game_id, {})
+        nodes: list[NightNode] = []
 
-        # Actions des loups IA (si pas déjà votée par humain loup)
+        # Votes des loups IA (si pas déjà votée par humain loup)
+        wolf_nodes = []
         if not game.night_actions.wolf_victim:
-            print(f"[NIGHT_LOG] Aucune victime loup définie, générant les votes des loups IA...")
-            wolf_votes = []
-            wolf_tasks = []
-
             for player in game.get_wolves():
                 if not player.is_human and player.is_alive:
                     agent = agents.get(player.name)
                     if agent:
-                        fellow_wolves = [p.name for p in game.get_wolves() if p.name != player.name]
-                        print(f"[NIGHT_LOG] Appel API pour {player.name} (loup IA) - autres loups: {fellow_wolves}")
-                        wolf_tasks.append(agent.generate_wolf_vote(fellow_wolves))
-
-            # Attendre TOUS les appels API en parallèle
-            if wolf_tasks:
-                print(f"[NIGHT_LOG] Attente de {len(wolf_tasks)} appels API pour les loups IA...")
-                wolf_results = await asyncio.gather(*wolf_tasks, return_exceptions=True)
-
-                for i, result in enumerate(wolf_results):
-                    if isinstance(result, Exception):
-                        print(f"[NIGHT_LOG] ERREUR pour loup IA {i}: {result}")
-                    elif result.get("target"):
-                        print(f"[NIGHT_LOG] Loup IA {i} vote pour {result.get('target')}")
-                        wolf_votes.append(result["target"])
-
-            if wolf_votes:
-                vote_count = Counter(wolf_votes)
-                game.night_actions.wolf_victim = vote_count.most_common(1)[0][0]
-                print(f"[NIGHT_LOG] Victime des loups définie: {game.night_actions.wolf_victim} (votes: {dict(vote_count)})")
+                        node_name = f"wolf:{player.name}"
+                        nodes.append(NightNode(node_name, self._night_wolf_vote_node(game, player, agent)))
+                        wolf_nodes.append(node_name)
         else:
-            print(f"[NIGHT_LOG] Victime loup déjà définie: {game.night_actions.wolf_victim}")
+            night_log.debug("Victime loup déjà définie: %s", game.night_actions.wolf_victim)
+
+        nodes.append(NightNode(
+            "wolf_victim",
+            lambda inputs: self._night_wolf_victim(game, inputs),
+            inputs=wolf_nodes
+        ))
 
         # Action de la voyante IA (seulement si pas humain)
         seer = next((p for p in game.players if p.role == Role.VOYANTE and p.is_alive and not p.is_human), None)
-        if seer and not game.night_actions.seer_target:
-            print(f"[NIGHT_LOG] Appel API pour {seer.name} (voyante IA)...")
-            agent = agents.get(seer.name)
-            if agent:
-                try:
-                    choice = await agent.generate_seer_choice()
-                    target_name = choice.get("target")
-                    target = game.get_player(target_name)
-                    if target:
-                        game.night_actions.seer_target = target.name
-                        game.night_actions.seer_result = target.role.display_name
-                        # Ajouter à la liste des découvertes permanentes de la voyante
-                        game.seer_discoveries[target.name] = target.role.display_name
-                        print(f"[NIGHT_LOG] Voyante IA a choisi: {target.name} ({target.role.display_name})")
-                        # L'agent mémorise le rôle découvert
-                        agent.update_memory("role_revealed", {"player": target.name, "role": target.role.display_name})
-                except Exception as e:
-                    print(f"[NIGHT_LOG] ERREUR voyante IA: {e}")
+        if seer and not game.night_actions.seer_target and seer.name in agents:
+            nodes.append(NightNode("seer", lambda _: self._night_seer(game, seer, agents[seer.name])))
+        elif seer:
+            night_log.debug("Cible voyante IA déjà définie: %s", game.night_actions.seer_target)
         else:
-            if seer:
-                print(f"[NIGHT_LOG] Cible voyante IA déjà définie: {game.night_actions.seer_target}")
-            else:
-                print(f"[NIGHT_LOG] Pas de voyante IA en vie")
+            night_log.info("Pas de voyante IA en vie")
 
-        # Action de la sorcière IA (seulement si pas humain ET pas de sorcière humaine)
+        # Action de la sorcière IA (seulement si pas humain), dépend de la victime des loups
         witch = next((p for p in game.players if p.role == Role.SORCIERE and p.is_alive and not p.is_human), None)
-        if witch:
-            print(f"[NIGHT_LOG] Appel API pour {witch.name} (sorcière IA)...")
-            agent = agents.get(witch.name)
-            if agent:
-                try:
-                    choice = await agent.generate_witch_choice(
-                        game.night_actions.wolf_victim,
-                        game.witch_potions.has_life_potion,
-                        game.witch_potions.has_death_potion
-                    )
-                    if choice.get("save") and game.witch_potions.has_life_potion:
-                        game.night_actions.witch_save = True
-                        game.witch_potions.has_life_potion = False
-                        print(f"[NIGHT_LOG] Sorcière IA sauve: {game.night_actions.wolf_victim}")
-                    if choice.get("kill") and game.witch_potions.has_death_potion:
-                        game.night_actions.witch_kill = choice["kill"]
-                        game.witch_potions.has_death_potion = False
-                        print(f"[NIGHT_LOG] Sorcière IA tue: {choice['kill']}")
-                except Exception as e:
-                    print(f"[NIGHT_LOG] ERREUR sorcière IA: {e}")
+        if witch and witch.name in agents:
+            nodes.append(NightNode(
+                "witch",
+                lambda _: self._night_witch(game, agents[witch.name]),
+                inputs=["wolf_victim"]
+            ))
         else:
-            print(f"[NIGHT_LOG] Pas de sorcière IA en vie")
-
-        print(f"[NIGHT_LOG] === Fin des actions nocturnes IA ===")
-
+            night_log.info("Pas de sorcière IA en vie")
+
+        results = await run_night_dag(nodes, on_node_done=self._on_night_node_done)
+        for node_name, node_result in results.items():
+            if isinstance(node_result, Exception):
+                night_log.warning("Échec du nœud %s: %s", node_name, node_result)
+
+        # Les décisions anticipées non utilisées sont abandonnées
+        self._discard_speculative_night(game.game_id)
+
+        night_log.info("=== Fin des actions nocturnes IA ===")
+
+    def _night_wolf_vote_node(self, game: GameState, player: Player, agent: AIAgent):
+        """Construit le nœud de vote d'un loup IA (réutilise le vote anticipé s'il existe)"""
+        async def run(_inputs: dict) -> dict:
+            speculative = self._take_speculative(game, "wolf_vote", player.name)
+            if speculative:
+                night_log.debug("Vote anticipé réutilisé pour %s (loup IA)", player.name)
+                return await speculative
+            fellow_wolves = [p.name for p in game.get_wolves() if p.name != player.name]
+            night_log.debug("Appel API pour %s (loup IA) - autres loups: %s", player.name, fellow_wolves)
+            return await agent.generate_wolf_vote(fellow_wolves)
+        return run
+
+    async def _night_wolf_victim(self, game: GameState, wolf_results: dict) -> Optional[str]:
+        """Agrège les votes des loups IA en une victime"""
+        if game.night_actions.wolf_victim:
+            return game.night_actions.wolf_victim
+
+        wolf_votes = []
+        for node_name, result in wolf_results.items():
+            if not result or not result.get("target"):
+                continue
+            target = game.get_player(result["target"])
+            if not target or not target.is_alive or target.role == Role.LOUP_GAROU:
+                night_log.info("Vote ignoré pour %s (cible invalide): %s", node_name, result.get('target'))
+                continue
+            night_log.debug("%s vote pour %s", node_name, result['target'])
+            wolf_votes.append(result["target"])
+
+        if wolf_votes:
+            vote_count = Counter(wolf_votes)
+            self._emit(game, WolfVictimChosen(vote_count.most_common(1)[0][0]))
+            night_log.info("Victime des loups définie: %s (votes: %s)", game.night_actions.wolf_victim, dict(vote_count))
+        return game.night_actions.wolf_victim
+
+    async def _night_seer(self, game: GameState, seer: Player, agent: AIAgent) -> Optional[str]:
+        """Choix de la voyante IA"""
+        speculative = self._take_speculative(game, "seer", seer.name)
+        if not speculative:
+            night_log.debug("Appel API pour %s (voyante IA)...", seer.name)
+        choice = await (speculative or agent.generate_seer_choice())
+        target = game.get_player(choice.get("target"))
+        if not target or not target.is_alive:
+            return None
+
+        self._emit(game, SeerDiscovery(target.name, target.role.display_name))
+        night_log.info("Voyante IA a choisi: %s (%s)", target.name, target.role.display_name)
+        # L'agent mémorise le rôle découvert
+        agent.update_memory("role_revealed", {"player": target.name, "role": target.role.display_name})
+        return target.name
+
+    async def _night_witch(self, game: GameState, agent: AIAgent) -> dict:
+        """Choix de la sorcière IA, une fois la victime des loups connue"""
+        night_log.debug("Appel API pour %s (sorcière IA)...", agent.player.name)
+        choice = await agent.generate_witch_choice(
+            game.night_actions.wolf_victim,
+            game.witch_potions.has_life_potion,
+            game.witch_potions.has_death_potion
+        )
+        if choice.get("save") and game.witch_potions.has_life_potion:
+            self._emit(game, PotionUsed("life", game.night_actions.wolf_victim))
+            night_log.info("Sorcière IA sauve: %s", game.night_actions.wolf_victim)
+        if choice.get("kill") and game.witch_potions.has_death_potion:
+            self._emit(game, PotionUsed("death", choice["kill"]))
+            night_log.info("Sorcière IA tue: %s", choice['kill'])
+        return choice
+
+    def _on_night_node_done(self, node_name: str, duration: float, error: Optional[BaseException]):
+        """Mesure de chaque nœud du graphe nocturne, relayée aux hooks enregistrés"""
+        status = f"ERREUR {error}" if error else "ok"
+        night_log.debug("Nœud %s terminé en %.2fs (%s)", node_name, duration, status)
+        for hook in self.night_node_hooks:
+            hook(node_name, duration, error)
+
+    @traced("night.resolve", _game_span_attributes)
     def _resolve_night(self, game: GameState) -> dict:
         """Résout les événements de la nuit"""
         events = {"deaths": [], "saved": None}
@@ -455,71 +634,70 @@ class GameEngine:
             else:
                 victim = game.get_player(victim_name)
                 if victim:
-                    victim.is_alive = False
+                    self._emit(game, PlayerKilled(victim.name, "loups"))
                     events["deaths"].append({
                         "name": victim_name,
                         "role": victim.role.display_name,
                         "cause": "loups"
                     })
-                    # Ajouter à l'historique texte
-                    game.history.append({
-                        "type": "death",
-                        "day": game.day_number,
-                        "message": f"{victim_name} a été tué et était {victim.role.display_name}"
-                    })
 
         # Victime de la sorcière
         witch_kill = game.night_actions.witch_kill
         if witch_kill:
             target = game.get_player(witch_kill)
             if target and target.is_alive:
-                target.is_alive = False
+                self._emit(game, PlayerKilled(target.name, "sorcière"))
                 events["deaths"].append({
                     "name": witch_kill,
                     "role": target.role.display_name,
                     "cause": "sorcière"
                 })
-                # Ajouter à l'historique texte
-                game.history.append({
-                    "type": "death",
-                    "day": game.day_number,
-                    "message": f"{witch_kill} a été tué et était {target.role.display_name}"
-                })
 
-        # Log dans l'historique
-        game.history.append({
-            "type": "night_end",
-            "day": game.day_number,
-            "events": events
-        })
-
-        # Reset des actions nocturnes
-        game.night_actions = NightActions()
+        # Historique et remise à zéro des actions nocturnes
+        self._emit(game, NightEnded(events))
 
         return events
 
-    def _save_discussions_history(self, game: GameState):
-        """Sauvegarde les discussions du jour courant dans l'historique"""
-        discussions = self.discussions_cache.get(game.game_id, [])
-        if discussions:
-            game.discussions_history[game.day_number] = discussions
+    def _schedule_day_summaries(self, game: GameState):
+        """Lance en tâche de fond le résumé de la journée pour chaque agent IA vivant"""
+        day = game.day_number
+        discussions = game.discussions_history.get(day, [])
+        votes = next(
+            (h.get("votes", {}) for h in reversed(game.history) if h.get("type") == "day_vote" and h.get("day") == day),
+            {}
+        )
+        deaths = [h["message"] for h in game.history if h.get("type") == "death" and h.get("day") == day]
 
-    async def _process_day_action_async(self, game: GameState, human: Player, action: dict) -> dict:
-        """Traite une action de jour"""
+        tasks = self.background_tasks.setdefault(game.game_id, set())
+        for player in game.get_alive_players():
+            if player.is_human:
+                continue
+            agent = self.ai_agents.get(game.game_id, {}).get(player.name)
+            if agent:
+                # Priorité basse : ne doit jamais retarder un appel attendu par l'humain
+                with llm_priority(Priority.BACKGROUND), llm_deadline(TURN_DEADLINE, inherit=False), detached():
+                    task = asyncio.create_task(agent.summarize_day(day, discussions, votes, deaths))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        day_log.info("%s résumés de journée planifiés en arrière-plan (jour %s)", len(tasks), day)
+
+    async def _process_day_action_async(self, game: GameState, human: Optional[Player], action: dict) -> dict:
+        """Traite une action de jour (human est None dans une partie sans humain)"""
         action_type = action.get("action")
         result = {"success": True, "messages": []}
-        print(f"\n[DAY_LOG] === DÉBUT traitement action jour: {action_type} pour {human.name} (jour {game.day_number}) ===")
+        human_name = human.name if human else "(sans humain)"
+        day_log.info("=== DÉBUT traitement action jour: %s pour %s (jour %s) ===", action_type, human_name, game.day_number, extra={"game_id": game.game_id})
 
         # Automatiser le jour si le joueur est mort
         if action_type == "auto_day":
-            print(f"[DAY_LOG] {human.name} est mort, automatisation complète du jour")
+            day_log.info("%s est mort, automatisation complète du jour", human_name)
             result["messages"].append("Le joueur est mort. Les IA discutent et votent automatiquement...")
 
             # Générer les discussions IA même si le joueur est mort
-            print(f"[DAY_LOG] Génération automatique des discussions...")
+            day_log.info("Génération automatique des discussions...")
             await self.generate_ai_discussion_async(game.game_id)
             discussions = self.discussions_cache.get(game.game_id, [])
-            print(f"[DAY_LOG] {len(discussions)} messages de discussion générés")
+            day_log.info("%s messages de discussion générés", len(discussions))
 
             votes = {}
 
@@ -537,15 +715,16 @@ class GameEngine:
 
             # Attendre TOUS les appels API en parallèle
             if vote_tasks:
-                print(f"[DAY_LOG] Génération des votes pour {len(vote_tasks)} IA en parallèle...")
-                vote_results = await asyncio.gather(*vote_tasks, return_exceptions=True)
+                day_log.info("Génération des votes pour %s IA en parallèle...", len(vote_tasks))
+                with span("day.votes", game_id=game.game_id, day=game.day_number, voters=len(vote_tasks)):
+                    vote_results = await asyncio.gather(*vote_tasks, return_exceptions=True)
 
                 for result_vote, ia_name in zip(vote_results, alive_ias):
                     if isinstance(result_vote, Exception):
-                        print(f"[DAY_LOG] ERREUR pour {ia_name}: {result_vote}")
+                        day_log.warning("Échec du vote de %s: %s", ia_name, result_vote)
                     elif result_vote.get("vote"):
                         votes[ia_name] = result_vote["vote"]
-                        print(f"[DAY_LOG] {ia_name} vote pour {result_vote['vote']}")
+                        day_log.debug("%s vote pour %s", ia_name, result_vote['vote'])
                         # Mettre à jour la mémoire
                         agents[ia_name].update_memory("vote", {"voter": ia_name, "target": result_vote["vote"]})
 
@@ -553,7 +732,7 @@ class GameEngine:
             vote_counts = Counter(votes.values())
             result["votes"] = dict(votes)
             result["vote_counts"] = dict(vote_counts)
-            print(f"[DAY_LOG] Votes comptés: {dict(vote_counts)}")
+            day_log.info("Votes comptés: %s", dict(vote_counts))
 
             # Déterminer le résultat
             if vote_counts:
@@ -564,7 +743,7 @@ class GameEngine:
                     eliminated_name = top_voted[0]
                     eliminated = game.get_player(eliminated_name)
                     if eliminated:
-                        eliminated.is_alive = False
+                        self._emit(game, PlayerKilled(eliminated.name, "vote"))
                         result["eliminated"] = {
                             "name": eliminated_name,
                             "role": eliminated.role.display_name,
@@ -574,7 +753,7 @@ class GameEngine:
                             f"{eliminated_name} a été éliminé avec {max_votes} votes. "
                             f"C'était un(e) {eliminated.role.display_name}."
                         )
-                        print(f"[DAY_LOG] {eliminated_name} éliminé ({eliminated.role.display_name})")
+                        day_log.info("%s éliminé (%s)", eliminated_name, eliminated.role.display_name)
                         # Mettre à jour la mémoire des agents
                         for agent in agents.values():
                             agent.update_memory("death", {
@@ -582,55 +761,39 @@ class GameEngine:
                                 "role": eliminated.role.display_name,
                                 "cause": "vote"
                             })
-                        # Ajouter à l'historique texte
-                        game.history.append({
-                            "type": "death",
-                            "day": game.day_number,
-                            "message": f"{eliminated_name} a été éliminé et était {eliminated.role.display_name}"
-                        })
                 else:
                     result["tie"] = True
                     result["messages"].append(
                         f"Égalité entre {', '.join(top_voted)}. Personne n'est éliminé."
                     )
-                    print(f"[DAY_LOG] Égalité entre {', '.join(top_voted)}")
+                    day_log.info("Égalité entre %s", ', '.join(top_voted))
 
             # Log
-            game.history.append({
-                "type": "day_vote",
-                "day": game.day_number,
-                "votes": votes,
-                "result": result.get("eliminated") or {"tie": True}
-            })
+            self._emit(game, VotesTallied(votes, result.get("eliminated") or {"tie": True}))
 
             # Vérifier la victoire
             victory = game.check_victory()
             if victory:
-                game.status = victory
-                result["game_over"] = {
-                    "winner": "Village" if victory == GameStatus.VICTOIRE_VILLAGE else "Loups-Garous",
-                    "status": victory.value
-                }
+                result["game_over"] = self._end_game(game, victory)
             else:
-                # Sauvegarder les discussions avant de passer à la nuit suivante
-                self._save_discussions_history(game)
+                # Résumer la journée en tâche de fond pendant que l'humain choisit son action de nuit
+                self._schedule_day_summaries(game)
                 # Passer à la nuit suivante
-                game.day_number += 1
-                game.phase = Phase.NUIT
-                game.pending_action = "auto_night"
+                self._emit(game, PhaseChanged(Phase.NUIT.value, game.day_number + 1, "auto_night"))
+                self._start_speculative_night(game)
 
             return result
 
         elif action_type == "day_vote" or action_type == "skip_day_vote":
             target_name = action.get("target")
-            print(f"[DAY_LOG] Joueur humain {human.name} vote pour {target_name}")
+            day_log.info("Joueur humain %s vote pour %s", human.name, target_name)
 
             # Collecter les votes
             votes = {human.name: target_name}
 
             # Récupérer les discussions pour contexte
             discussions = self.discussions_cache.get(game.game_id, [])
-            print(f"[DAY_LOG] Contexte: {len(discussions)} messages de discussion")
+            day_log.debug("Contexte: %s messages de discussion", len(discussions))
 
             # Générer les votes IA en parallèle
             agents = self.ai_agents.get(game.game_id, {})
@@ -646,15 +809,16 @@ class GameEngine:
 
             # Attendre TOUS les appels API en parallèle
             if vote_tasks:
-                print(f"[DAY_LOG] Génération des votes pour {len(vote_tasks)} IA en parallèle...")
-                vote_results = await asyncio.gather(*vote_tasks, return_exceptions=True)
+                day_log.info("Génération des votes pour %s IA en parallèle...", len(vote_tasks))
+                with span("day.votes", game_id=game.game_id, day=game.day_number, voters=len(vote_tasks)):
+                    vote_results = await asyncio.gather(*vote_tasks, return_exceptions=True)
 
                 for result_vote, ia_name in zip(vote_results, alive_ias):
                     if isinstance(result_vote, Exception):
-                        print(f"[DAY_LOG] ERREUR pour {ia_name}: {result_vote}")
+                        day_log.warning("Échec du vote de %s: %s", ia_name, result_vote)
                     elif result_vote.get("vote"):
                         votes[ia_name] = result_vote["vote"]
-                        print(f"[DAY_LOG] {ia_name} vote pour {result_vote['vote']}")
+                        day_log.debug("%s vote pour %s", ia_name, result_vote['vote'])
                         # Mettre à jour la mémoire
                         agents[ia_name].update_memory("vote", {"voter": ia_name, "target": result_vote["vote"]})
 
@@ -662,7 +826,7 @@ class GameEngine:
             vote_counts = Counter(votes.values())
             result["votes"] = dict(votes)
             result["vote_counts"] = dict(vote_counts)
-            print(f"[DAY_LOG] Votes comptés: {dict(vote_counts)}")
+            day_log.info("Votes comptés: %s", dict(vote_counts))
 
             # Déterminer le résultat
             if vote_counts:
@@ -673,7 +837,7 @@ class GameEngine:
                     eliminated_name = top_voted[0]
                     eliminated = game.get_player(eliminated_name)
                     if eliminated:
-                        eliminated.is_alive = False
+                        self._emit(game, PlayerKilled(eliminated.name, "vote"))
                         result["eliminated"] = {
                             "name": eliminated_name,
                             "role": eliminated.role.display_name,
@@ -683,7 +847,7 @@ class GameEngine:
                             f"{eliminated_name} a été éliminé avec {max_votes} votes. "
                             f"C'était un(e) {eliminated.role.display_name}."
                         )
-                        print(f"[DAY_LOG] {eliminated_name} éliminé ({eliminated.role.display_name})")
+                        day_log.info("%s éliminé (%s)", eliminated_name, eliminated.role.display_name)
                         # Mettre à jour la mémoire des agents
                         for agent in agents.values():
                             agent.update_memory("death", {
@@ -691,55 +855,48 @@ class GameEngine:
                                 "role": eliminated.role.display_name,
                                 "cause": "vote"
                             })
-                        # Ajouter à l'historique texte
-                        game.history.append({
-                            "type": "death",
-                            "day": game.day_number,
-                            "message": f"{eliminated_name} a été éliminé et était {eliminated.role.display_name}"
-                        })
                 else:
                     result["tie"] = True
                     result["messages"].append(
                         f"Égalité entre {', '.join(top_voted)}. Personne n'est éliminé."
                     )
-                    print(f"[DAY_LOG] Égalité entre {', '.join(top_voted)}")
+                    day_log.info("Égalité entre %s", ', '.join(top_voted))
 
             # Log
-            game.history.append({
-                "type": "day_vote",
-                "day": game.day_number,
-                "votes": votes,
-                "result": result.get("eliminated") or {"tie": True}
-            })
+            self._emit(game, VotesTallied(votes, result.get("eliminated") or {"tie": True}))
 
             # Vérifier la victoire
             victory = game.check_victory()
             if victory:
-                game.status = victory
-                result["game_over"] = {
-                    "winner": "Village" if victory == GameStatus.VICTOIRE_VILLAGE else "Loups-Garous",
-                    "status": victory.value
-                }
-                print(f"[DAY_LOG] FIN DE PARTIE: {result['game_over']['winner']} gagne")
+                result["game_over"] = self._end_game(game, victory)
+                day_log.info("FIN DE PARTIE: %s gagne", result['game_over']['winner'], extra={"game_id": game.game_id})
             else:
-                # Sauvegarder les discussions avant de passer à la nuit suivante
-                self._save_discussions_history(game)
+                # Résumer la journée en tâche de fond pendant que l'humain choisit son action de nuit
+                self._schedule_day_summaries(game)
                 # Passer à la nuit suivante
-                game.day_number += 1
-                game.phase = Phase.NUIT
                 human_player = next((p for p in game.players if p.is_human), None)
                 if human_player and human_player.is_alive:
-                    game.pending_action = self._get_pending_action(
+                    pending_action = self._get_pending_action(
                         game.players, Phase.NUIT, human_player.role
                     )
                 else:
                     # Le joueur est mort, automatiser la nuit
-                    game.pending_action = "auto_night"
-                print(f"[DAY_LOG] Passage à la nuit {game.day_number}")
+                    pending_action = "auto_night"
+                self._emit(game, PhaseChanged(Phase.NUIT.value, game.day_number + 1, pending_action))
+                self._start_speculative_night(game)
+                day_log.info("Passage à la nuit %s", game.day_number)
 
-        print(f"[DAY_LOG] === FIN traitement {action_type} ===\n")
+        day_log.debug("=== FIN traitement %s ===", action_type)
         return result
 
+    def _presynthesize(self, player: Player, message: str):
+        """Confie la réplique à la synthèse vocale en arrière-plan, avant que le navigateur ne la demande"""
+        if os.environ.get("TTS_PRESYNTHESIS", "1") != "1":
+            return
+        tts_service = get_tts_service()
+        if tts_service and player.voice_id:
+            tts_service.presynthesize(message, player.voice_id)
+
     def get_cached_discussions(self, game_id: str) -> list[dict]:
         """Retourne toutes les discussions du cache (sans générer de nouvelles)"""
         return self.discussions_cache.get(game_id, [])
@@ -750,6 +907,15 @@ class GameEngine:
         if not game or game.phase != Phase.JOUR:
             return []
 
+        # Une ronde de discussion est bornée : les orateurs au-delà de l'échéance utilisent le repli
+        with span("day.discussion", game_id=game_id, day=game.day_number), \
+                DISCUSSION_ROUND_SECONDS.time(), llm_deadline(TURN_DEADLINE):
+            return await self._generate_ai_discussion_round(game)
+
+    async def _generate_ai_discussion_round(self, game: GameState) -> list[dict]:
+        """Fait parler les IA dans l'ordre jusqu'au tour de l'humain ou la fin de la ronde"""
+        game_id = game.game_id
+
         agents = self.ai_agents.get(game_id, {})
         existing_discussions = self.discussions_cache.get(game_id, [])
 
@@ -774,7 +940,7 @@ class GameEngine:
                 "current_index": 0,
                 "completed": False
             }
-            print(f"Ordre de discussion : {self.discussion_state[game_id]['order']}")
+            discussion_log.debug("Ordre de discussion : %s", self.discussion_state[game_id]['order'])
 
         state = self.discussion_state[game_id]
         discussions = []
@@ -791,8 +957,8 @@ class GameEngine:
 
             # Si c'est le tour de l'humain, mettre à jour pending_action et attendre
             if current_player.is_human:
-                game.pending_action = "human_discussion"
-                print(f"C'est au tour de {current_player_name} (humain) de parler")
+                self._emit(game, PendingActionChanged("human_discussion"))
+                discussion_log.info("C'est au tour de %s (humain) de parler", current_player_name)
                 break
 
             # Faire parler l'IA
@@ -810,18 +976,17 @@ class GameEngine:
                 }
                 discussions.append(discussion)
                 existing_discussions.append(discussion)
-                print(f"[MESSAGE_DISPLAY] AI MESSAGE (day {game.day_number}) - {current_player_name}: {message_texte}")
+                self._emit(game, DiscussionEntry(game.day_number, current_player_name, message_texte))
+                self._presynthesize(current_player, message_texte)
+                discussion_log.info("AI MESSAGE (day %s) - %s: %s", game.day_number, current_player_name, message_texte)
 
                 # Si l'IA cible quelqu'un, gérer la réponse
                 if nom_agent_2:
-                    print(f"je veux viser {nom_agent_2}")
-                    print("="*100)
-                    print(message)
-                    print("="*100)
+                    discussion_log.debug("%s vise %s - réponse complète: %s", current_player_name, nom_agent_2, message)
                     target_check = game.get_player(nom_agent_2)
                     if target_check and target_check.is_human :
-                        game.pending_action = "human_discussion"
-                        print(f"C'est au tour de {nom_agent_2} de parler")
+                        self._emit(game, PendingActionChanged("human_discussion"))
+                        discussion_log.info("C'est au tour de %s de parler", nom_agent_2)
                         break
                     else :
                         target_player = game.get_player(nom_agent_2)
@@ -840,15 +1005,17 @@ class GameEngine:
                                     }
                                     discussions.append(discussion_2)
                                     existing_discussions.append(discussion_2)
-                                    print(f"[MESSAGE_DISPLAY] AI REPLY (day {game.day_number}) - {nom_agent_2} replies to {current_player_name}: {message_texte_2}")
+                                    self._emit(game, DiscussionEntry(game.day_number, nom_agent_2, message_texte_2))
+                                    self._presynthesize(target_player, message_texte_2)
+                                    discussion_log.info("AI REPLY (day %s) - %s replies to %s: %s", game.day_number, nom_agent_2, current_player_name, message_texte_2)
 
             state["current_index"] += 1
 
         # Vérifier si tous les joueurs ont parlé
         if state["current_index"] >= len(state["order"]):
             state["completed"] = True
-            game.pending_action = "day_vote"  # Passer au vote
-            print("Tous les joueurs ont parlé, passage au vote")
+            self._emit(game, PendingActionChanged("day_vote"))  # Passer au vote
+            discussion_log.info("Tous les joueurs ont parlé, passage au vote")
 
         # Mettre en cache
         self.discussions_cache[game_id] = existing_discussions
@@ -865,22 +1032,31 @@ class GameEngine:
 
         return loop.run_until_complete(self.generate_ai_discussion_async(game_id))
 
-    async def send_human_message_async(self, game_id: str, message: str) -> dict:
-        """Traite le message du joueur humain pendant les discussions"""
+    def check_human_message(self, game_id: str) -> Optional[str]:
+        """Vérifications préalables d'un message humain (message d'erreur, ou None s'il peut être traité)"""
         game = self.get_game(game_id)
         if not game:
-            return {"error": "Partie non trouvée"}
+            return "Partie non trouvée"
 
         if game.phase != Phase.JOUR:
-            return {"error": "Pas en phase de jour"}
+            return "Pas en phase de jour"
 
         human = next((p for p in game.players if p.is_human), None)
         if not human or not human.is_alive:
-            return {"error": "Joueur humain non trouvé ou mort"}
+            return "Joueur humain non trouvé ou mort"
 
         # Vérifier que c'est bien le tour de l'humain
         if game.pending_action != "human_discussion":
-            return {"error": "Ce n'est pas votre tour de parler"}
+            return "Ce n'est pas votre tour de parler"
+        return None
+
+    async def send_human_message_async(self, game_id: str, message: str) -> dict:
+        """Traite le message du joueur humain pendant les discussions"""
+        error = self.check_human_message(game_id)
+        if error:
+            return {"error": error}
+        game = self.get_game(game_id)
+        human = next(p for p in game.players if p.is_human)
 
         existing_discussions = self.discussions_cache.get(game_id, [])
 
@@ -891,7 +1067,8 @@ class GameEngine:
         }
         existing_discussions.append(discussion)
         self.discussions_cache[game_id] = existing_discussions
-        print(f"[MESSAGE_DISPLAY] HUMAN MESSAGE (day {game.day_number}) - {human.name}: {message}")
+        self._emit(game, DiscussionEntry(game.day_number, human.name, message))
+        discussion_log.info("HUMAN MESSAGE (day %s) - %s: %s", game.day_number, human.name, message)
 
         # Passer au joueur suivant dans l'ordre
         state = self.discussion_state.get(game_id)
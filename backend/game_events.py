@@ -0,0 +1,254 @@
+"""
+Événements de partie : chaque transition d'état du moteur est un événement appliqué
+par un réducteur déterministe, et l'état se reconstruit depuis le journal
+(points de reprise + relecture des événements suivants)
+"""
+import copy
+import os
+from dataclasses import asdict, dataclass, field, fields
+from typing import Optional
+
+import msgpack
+
+from .models import GameState, GameStatus, NightActions, Phase, Player, Role, WitchPotions
+from .snapshots import pack_game_state, unpack_game_state
+
+
+# Un point de reprise tous les N événements (0 = jamais, relecture depuis le début)
+CHECKPOINT_INTERVAL = int(os.environ.get("EVENT_CHECKPOINT_INTERVAL", "50"))
+
+
+@dataclass(frozen=True)
+class GameEvent:
+    """Base des événements : des données simples uniquement (chaînes, nombres, listes, dicts)"""
+
+    def to_dict(self) -> dict:
+        return {"type": type(self).__name__, **asdict(self)}
+
+
+@dataclass(frozen=True)
+class GameStarted(GameEvent):
+    game_id: str
+    players: list[dict]  # name, role, is_human, personality, voice_id
+    pending_action: Optional[str]
+
+
+@dataclass(frozen=True)
+class WolfVictimChosen(GameEvent):
+    target: str
+
+
+@dataclass(frozen=True)
+class SeerDiscovery(GameEvent):
+    target: str
+    role: str  # nom affiché du rôle
+
+
+@dataclass(frozen=True)
+class PotionUsed(GameEvent):
+    potion: str  # "life" ou "death"
+    target: Optional[str]
+
+
+@dataclass(frozen=True)
+class PlayerKilled(GameEvent):
+    player: str
+    cause: str  # "loups", "sorcière" ou "vote"
+
+
+@dataclass(frozen=True)
+class NightEnded(GameEvent):
+    events: dict  # morts et joueur sauvé, tels que renvoyés au client
+
+
+@dataclass(frozen=True)
+class VotesTallied(GameEvent):
+    votes: dict[str, str]  # votant -> cible
+    result: dict  # joueur éliminé, ou {"tie": True}
+
+
+@dataclass(frozen=True)
+class DiscussionEntry(GameEvent):
+    day: int
+    player: str
+    message: str
+
+
+@dataclass(frozen=True)
+class PhaseChanged(GameEvent):
+    phase: str
+    day_number: int
+    pending_action: Optional[str]
+
+
+@dataclass(frozen=True)
+class PendingActionChanged(GameEvent):
+    pending_action: Optional[str]
+
+
+@dataclass(frozen=True)
+class GameEnded(GameEvent):
+    status: str
+
+
+EVENT_TYPES: dict[str, type[GameEvent]] = {
+    cls.__name__: cls for cls in (
+        GameStarted, WolfVictimChosen, SeerDiscovery, PotionUsed, PlayerKilled, NightEnded,
+        VotesTallied, DiscussionEntry, PhaseChanged, PendingActionChanged, GameEnded,
+    )
+}
+
+
+def event_from_dict(data: dict) -> GameEvent:
+    cls = EVENT_TYPES[data["type"]]
+    return cls(**{f.name: data[f.name] for f in fields(cls)})
+
+
+def start_state(event: GameStarted) -> GameState:
+    """État initial d'une partie"""
+    players = [
+        Player(
+            name=p["name"], role=Role(p["role"]), is_human=p["is_human"],
+            personality=p.get("personality"), voice_id=p.get("voice_id")
+        )
+        for p in event.players
+    ]
+    human = next((p for p in players if p.is_human), None)
+    return GameState(
+        game_id=event.game_id,
+        players=players,
+        phase=Phase.NUIT,
+        day_number=1,
+        status=GameStatus.EN_COURS,
+        witch_potions=WitchPotions(),
+        night_actions=NightActions(),
+        history=[{
+            "type": "game_start",
+            "day": 1,
+            "players": [p.name for p in players],
+            "human_role": human.role.display_name if human else None
+        }],
+        pending_action=event.pending_action
+    )
+
+
+def apply_event(game: GameState, event: GameEvent) -> GameState:
+    """
+    Applique un événement à l'état, en place. Seule fonction qui fait évoluer l'état
+    d'une partie : déterministe, sans effet de bord en dehors de `game`.
+    """
+    if isinstance(event, WolfVictimChosen):
+        game.night_actions.wolf_victim = event.target
+    elif isinstance(event, SeerDiscovery):
+        game.night_actions.seer_target = event.target
+        game.night_actions.seer_result = event.role
+        # Découvertes permanentes de la voyante
+        game.seer_discoveries[event.target] = event.role
+    elif isinstance(event, PotionUsed):
+        if event.potion == "life":
+            game.night_actions.witch_save = True
+            game.witch_potions.has_life_potion = False
+        else:
+            game.night_actions.witch_kill = event.target
+            game.witch_potions.has_death_potion = False
+    elif isinstance(event, PlayerKilled):
+        player = game.get_player(event.player)
+        player.is_alive = False
+        verb = "a été éliminé" if event.cause == "vote" else "a été tué"
+        game.history.append({
+            "type": "death",
+            "day": game.day_number,
+            "message": f"{player.name} {verb} et était {player.role.display_name}"
+        })
+    elif isinstance(event, NightEnded):
+        game.history.append({"type": "night_end", "day": game.day_number, "events": event.events})
+        game.night_actions = NightActions()
+    elif isinstance(event, VotesTallied):
+        game.history.append({
+            "type": "day_vote",
+            "day": game.day_number,
+            "votes": event.votes,
+            "result": event.result
+        })
+    elif isinstance(event, DiscussionEntry):
+        game.discussions_history.setdefault(event.day, []).append(
+            {"player": event.player, "message": event.message}
+        )
+    elif isinstance(event, PhaseChanged):
+        game.phase = Phase(event.phase)
+        game.day_number = event.day_number
+        game.pending_action = event.pending_action
+    elif isinstance(event, PendingActionChanged):
+        game.pending_action = event.pending_action
+    elif isinstance(event, GameEnded):
+        game.status = GameStatus(event.status)
+    else:
+        raise ValueError(f"Événement inattendu : {event!r}")
+    return game
+
+
+def reduce(game: Optional[GameState], event: GameEvent) -> GameState:
+    """Version pure de apply_event : renvoie un nouvel état sans toucher à `game`"""
+    if isinstance(event, GameStarted):
+        return start_state(event)
+    return apply_event(copy.deepcopy(game), event)
+
+
+@dataclass
+class EventLog:
+    """
+    Journal des événements d'une partie. Ajouter est une simple insertion en fin de
+    liste ; un point de reprise (état sérialisé) est pris tous les `checkpoint_interval`
+    événements pour que la reconstruction ne relise que la fin du journal.
+    """
+    events: list[GameEvent] = field(default_factory=list)
+    checkpoints: list[tuple[int, bytes]] = field(default_factory=list)  # (événements appliqués, état)
+    checkpoint_interval: int = CHECKPOINT_INTERVAL
+
+    @classmethod
+    def starting_from(cls, game: GameState) -> "EventLog":
+        """Journal d'une partie dont on ne connaît que l'état courant (restauration)"""
+        log = cls()
+        log.checkpoint(game)
+        return log
+
+    def append(self, event: GameEvent, game: GameState):
+        """Enregistre un événement déjà appliqué à `game`"""
+        self.events.append(event)
+        if self.checkpoint_interval and len(self.events) % self.checkpoint_interval == 0:
+            self.checkpoint(game)
+
+    def checkpoint(self, game: GameState):
+        self.checkpoints.append((len(self.events), msgpack.packb(pack_game_state(game))))
+
+    @property
+    def first(self) -> int:
+        """
+        Plus petite valeur de `upto` acceptée par rebuild : 1 pour une nouvelle partie
+        (aucun état avant GameStarted), 0 pour un journal repris d'un état restauré
+        """
+        return 0 if self.checkpoints and self.checkpoints[0][0] == 0 else 1
+
+    def rebuild(self, upto: Optional[int] = None) -> GameState:
+        """
+        État après les `upto` premiers événements du journal (tous par défaut).
+        GameStarted compte comme un événement : upto=1 est la partie qui vient d'être
+        créée ; upto=0 n'a de sens que pour un journal repris d'une restauration.
+
+        Raises:
+            ValueError si upto est hors de [first, len(events)]
+        """
+        upto = len(self.events) if upto is None else upto
+        if not self.first <= upto <= len(self.events):
+            raise ValueError(f"upto doit être compris entre {self.first} et {len(self.events)}")
+        base = next(((n, data) for n, data in reversed(self.checkpoints) if n <= upto), None)
+        if base:
+            start, data = base
+            game = unpack_game_state(msgpack.unpackb(data, strict_map_key=False))
+        elif self.events and isinstance(self.events[0], GameStarted):
+            start, game = 1, start_state(self.events[0])
+        else:
+            raise ValueError("Journal sans point de départ")
+        for event in self.events[start:upto]:
+            apply_event(game, event)
+        return game
@@ -0,0 +1,222 @@
+"""
+In-process job queue for long engine operations (night and day rounds of LLM calls):
+endpoints enqueue the work and return a job ID, a bounded pool of workers runs it
+"""
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+
+from .log import get_logger
+from .metrics import JOB_SECONDS, JOBS_QUEUED
+
+
+job_log = get_logger("jobs")
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """Too many jobs waiting: the caller should retry later"""
+
+
+class GameBusy(Exception):
+    """The game already has a job queued or running"""
+
+    def __init__(self, job: "Job"):
+        super().__init__(f"Game {job.game_id} already has job {job.job_id} {job.status.value}")
+        self.job = job
+
+
+@dataclass
+class Job:
+    game_id: str
+    kind: str
+    work: Callable[[], Awaitable[dict]] = field(repr=False)
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "game_id": self.game_id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    FIFO of engine jobs run by a fixed number of worker tasks.
+
+    A game has at most one job queued or running at a time (its state is not safe
+    to mutate concurrently). Finished jobs are kept for `ttl` seconds so clients
+    can fetch their result.
+    """
+
+    def __init__(self, workers: int = 4, max_queued: int = 100, ttl: float = 600):
+        self.workers = workers
+        self.ttl = ttl
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_queued)
+        self._jobs: dict[str, Job] = {}
+        self._active_by_game: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task] = []
+        self.completed = 0
+        self.failed = 0
+
+    def _ensure_workers(self):
+        """Workers are started lazily, on the loop of the first submit"""
+        self._tasks = [t for t in self._tasks if not t.done()]
+        for i in range(len(self._tasks), self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"job-worker-{i}"))
+
+    def submit(self, game_id: str, kind: str, work: Callable[[], Awaitable[dict]]) -> Job:
+        """
+        Enqueue work() for a game.
+
+        Raises:
+            GameBusy if the game already has an unfinished job
+            JobQueueFull if max_queued jobs are already waiting
+        """
+        self._expire()
+        active = self.active(game_id)
+        if active:
+            raise GameBusy(active)
+
+        job = Job(game_id, kind, work)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFull(f"{self._queue.maxsize} jobs already queued")
+        self._jobs[job.job_id] = job
+        self._active_by_game[game_id] = job
+        JOBS_QUEUED.set(self._queue.qsize())
+        self._ensure_workers()
+        job_log.debug("Job queued", extra={"job_id": job.job_id, "game_id": game_id, "kind": kind})
+        return job
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            JOBS_QUEUED.set(self._queue.qsize())
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = await job.work()
+            if "error" in job.result:
+                job.status, job.error = JobStatus.FAILED, job.result["error"]
+            else:
+                job.status = JobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            job.status, job.error = JobStatus.FAILED, "cancelled"
+            raise
+        except Exception as e:
+            job_log.exception("Job failed", extra={"job_id": job.job_id, "game_id": job.game_id})
+            job.status, job.error = JobStatus.FAILED, str(e) or type(e).__name__
+        finally:
+            job.finished_at = time.time()
+            if job.status == JobStatus.SUCCEEDED:
+                self.completed += 1
+            else:
+                self.failed += 1
+            JOB_SECONDS.observe(job.finished_at - job.started_at, kind=job.kind, status=job.status.value)
+            job.done.set()
+
+    def active(self, game_id: str) -> Optional[Job]:
+        """The game's job still queued or running, if any"""
+        job = self._active_by_game.get(game_id)
+        return job if job and not job.finished else None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout: Optional[float] = None) -> Job:
+        """Wait until the job finishes or the timeout elapses (the job keeps running)"""
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        for job_id in [j.job_id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            job = self._jobs.pop(job_id)
+            if self._active_by_game.get(job.game_id) is job:
+                del self._active_by_game[job.game_id]
+
+    async def close(self):
+        """Stop the workers; queued jobs fail with "shutdown" and running ones are cancelled"""
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            self._queue.task_done()
+            job.status, job.error = JobStatus.FAILED, "shutdown"
+            job.finished_at = time.time()
+            self.failed += 1
+            job.done.set()
+        JOBS_QUEUED.set(0)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        self._expire()
+        by_status = {s.value: 0 for s in JobStatus}
+        for job in self._jobs.values():
+            by_status[job.status.value] += 1
+        return {
+            "workers": self.workers,
+            "running_workers": sum(1 for t in self._tasks if not t.done()),
+            "queued": self._queue.qsize(),
+            "max_queued": self._queue.maxsize,
+            "jobs": by_status,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+# Global queue
+_job_queue: JobQueue | None = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or create the process-wide job queue (JOB_WORKERS, JOB_MAX_QUEUED, JOB_TTL)"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(
+            workers=int(os.environ.get("JOB_WORKERS", "4")),
+            max_queued=int(os.environ.get("JOB_MAX_QUEUED", "100")),
+            ttl=float(os.environ.get("JOB_TTL", "600")),
+        )
+    return _job_queue
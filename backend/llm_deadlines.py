@@ -0,0 +1,129 @@
+"""
+Échéances propagées aux appels LLM et requêtes de couverture (hedging)
+pour borner la latence de queue
+"""
+import asyncio
+import os
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+
+
+# Échéance absolue (horloge de la boucle asyncio) de l'opération en cours
+_current_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+# Durée maximale d'une opération du moteur (une action, une ronde de discussion)
+TURN_DEADLINE = float(os.environ.get("LLM_TURN_DEADLINE", "30"))
+# Percentile de latence au-delà duquel un appel encore en cours est doublé
+HEDGE_PERCENTILE = float(os.environ.get("LLM_HEDGE_PERCENTILE", "0.95"))
+# Nombre minimal de mesures avant d'activer le hedging pour un type d'appel
+HEDGE_MIN_SAMPLES = 20
+
+
+@contextmanager
+def llm_deadline(seconds: float, inherit: bool = True):
+    """
+    Fixe l'échéance des appels LLM du bloc (et des tâches créées dedans).
+
+    Avec inherit=True, une échéance englobante plus proche reste prioritaire ;
+    inherit=False donne un budget propre (tâches de fond, anticipations).
+    """
+    deadline = asyncio.get_running_loop().time() + seconds
+    current = _current_deadline.get()
+    if inherit and current is not None:
+        deadline = min(deadline, current)
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Temps restant avant l'échéance courante (None si aucune)"""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - asyncio.get_running_loop().time()
+
+
+class LatencyTracker:
+    """Latences récentes par type d'appel, pour déclencher le hedging au bon percentile"""
+
+    def __init__(self, max_samples: int = 200):
+        self.max_samples = max_samples
+        self.samples: dict[str, deque[float]] = {}
+
+    def record(self, call_type: str, seconds: float):
+        self.samples.setdefault(call_type, deque(maxlen=self.max_samples)).append(seconds)
+
+    def percentile(self, call_type: str, q: float) -> Optional[float]:
+        samples = self.samples.get(call_type)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+latency_tracker = LatencyTracker()
+
+
+async def hedged_call(
+    make_call: Callable[[asyncio.Event], Awaitable[Any]],
+    hedge_after: Optional[float],
+    timeout: Optional[float],
+    can_hedge: Optional[Callable[[], bool]] = None
+) -> Any:
+    """
+    Lance make_call(started) et, s'il n'a pas répondu hedge_after secondes après
+    avoir obtenu sa place (started est levé par l'appel à ce moment-là), une
+    seconde copie ; renvoie la première réponse réussie.
+
+    Le délai ne compte donc pas l'attente dans l'ordonnanceur, et la copie n'est
+    pas lancée si can_hedge() est faux (d'autres appels attendent déjà leur tour).
+    Une copie perdante annulée ne libère pas son thread : l'appel doit borner
+    lui-même sa durée.
+
+    Raises:
+        TimeoutError si aucune réponse n'arrive avant timeout
+    """
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout if timeout is not None else None
+    started = asyncio.Event()
+    pending = {asyncio.ensure_future(make_call(started))}
+    # Tant que le premier appel attend sa place, on attend aussi son signal de départ
+    start_signal = asyncio.ensure_future(started.wait()) if hedge_after is not None else None
+    hedge_at: Optional[float] = None
+    last_error: Optional[BaseException] = None
+
+    try:
+        while pending:
+            now = loop.time()
+            waits = [t - now for t in (end, hedge_at) if t is not None]
+            wait = max(min(waits), 0) if waits else None
+
+            watched = pending | {start_signal} if start_signal else pending
+            done, _ = await asyncio.wait(watched, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            for task in done & pending:
+                pending.discard(task)
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+
+            if end is not None and loop.time() >= end:
+                raise TimeoutError("LLM call exceeded its deadline")
+            if start_signal is not None and start_signal.done():
+                start_signal = None
+                hedge_at = loop.time() + hedge_after
+            if hedge_at is not None and loop.time() >= hedge_at:
+                hedge_at = None
+                if pending and (can_hedge is None or can_hedge()):
+                    pending.add(asyncio.ensure_future(make_call(asyncio.Event())))
+
+        raise last_error
+    finally:
+        for task in pending:
+            task.cancel()
+        if start_signal is not None:
+            start_signal.cancel()
@@ -0,0 +1,101 @@
+"""
+Réponses LLM enregistrées et rejouées : un appel est identifié par l'empreinte de
+(modèle, prompts, max_tokens), pour relancer des parties à l'identique sans API
+"""
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+# "anthropic" (défaut), "offline" (aucun appel : chaque agent utilise son repli heuristique)
+# ou "replay" (réponses lues dans LLM_REPLAY_FILE, repli si absente)
+LLM_BACKEND = os.environ.get("LLM_BACKEND", "anthropic")
+REPLAY_FILE = os.environ.get("LLM_REPLAY_FILE", "llm_replay.jsonl")
+# Enregistre les réponses des appels réels dans LLM_REPLAY_FILE
+RECORD = os.environ.get("LLM_RECORD", "0") == "1"
+
+
+class LLMUnavailable(Exception):
+    """Pas de réponse LLM pour cet appel (backend hors ligne, ou absente de l'enregistrement)"""
+
+
+@dataclass
+class _TextBlock:
+    text: str
+
+
+@dataclass
+class ReplayResponse:
+    """Même forme que la réponse du SDK, pour ce que les agents en lisent"""
+    content: list[_TextBlock]
+    usage: None = None
+
+
+def replay_key(model: str, system_prompt: str, user_prompt: str, max_tokens: int) -> str:
+    digest = hashlib.sha256()
+    for part in (model, str(max_tokens), system_prompt, user_prompt):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@dataclass
+class ReplayStore:
+    """Fichier JSONL, une réponse par ligne ; la dernière réponse d'une empreinte l'emporte"""
+    path: Path
+    responses: Optional[dict[str, str]] = None
+    hits: int = 0
+    misses: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _load(self) -> dict[str, str]:
+        if self.responses is None:
+            self.responses = {}
+            if self.path.exists():
+                with self.path.open(encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self.responses[entry["key"]] = entry["text"]
+        return self.responses
+
+    def response(self, model: str, system_prompt: str, user_prompt: str, max_tokens: int) -> ReplayResponse:
+        """
+        Raises:
+            LLMUnavailable si l'appel n'a pas été enregistré
+        """
+        text = self._load().get(replay_key(model, system_prompt, user_prompt, max_tokens))
+        if text is None:
+            self.misses += 1
+            raise LLMUnavailable("Réponse absente de l'enregistrement")
+        self.hits += 1
+        return ReplayResponse([_TextBlock(text)])
+
+    def record(self, model: str, system_prompt: str, user_prompt: str, max_tokens: int, call_type: str, text: str):
+        """Ajoute une réponse au fichier (appelé depuis un thread)"""
+        key = replay_key(model, system_prompt, user_prompt, max_tokens)
+        line = json.dumps({"key": key, "call_type": call_type, "text": text}, ensure_ascii=False)
+        with self._lock:
+            self._load()[key] = text
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def stats(self) -> dict:
+        return {"responses": len(self._load()), "hits": self.hits, "misses": self.misses}
+
+
+# Enregistrement global
+_replay_store: ReplayStore | None = None
+
+
+def get_replay_store() -> ReplayStore:
+    """Récupère ou crée l'enregistrement partagé (LLM_REPLAY_FILE)"""
+    global _replay_store
+    if _replay_store is None:
+        _replay_store = ReplayStore(Path(REPLAY_FILE))
+    return _replay_store
@@ -0,0 +1,213 @@
+"""
+Ordonnanceur global des appels LLM : budgets par minute, classes de priorité
+et équité entre parties
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Optional
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # Un humain attend la réponse
+    SPECULATIVE = 1  # Anticipation qui sera peut-être utilisée
+    BACKGROUND = 2   # Travail de fond (résumés, etc.)
+
+
+# Priorité des appels lancés depuis le contexte courant (héritée par les tâches créées)
+_current_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: Priority):
+    """Fixe la priorité des appels LLM (et des tâches créées) dans ce bloc"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+@dataclass
+class Grant:
+    """Place accordée dans la fenêtre glissante, ajustée avec la consommation réelle"""
+    granted_at: float
+    tokens: int
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    tokens: int
+    enqueued_at: float
+
+
+@dataclass
+class _WaitStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+@dataclass
+class LLMScheduler:
+    """
+    File d'attente unique pour tous les appels AIAgent du processus.
+
+    Les requêtes sont servies par ordre de priorité, puis à tour de rôle entre
+    les parties d'une même priorité, tant que les budgets requêtes/minute et
+    tokens/minute le permettent.
+    """
+    requests_per_minute: int = 50
+    tokens_per_minute: int = 50000
+    window: float = 60.0
+    _queues: dict[Priority, OrderedDict] = field(default_factory=lambda: {p: OrderedDict() for p in Priority})
+    _grants: deque = field(default_factory=deque)
+    _retry_handle: Optional[asyncio.TimerHandle] = None
+    _wait_stats: dict[Priority, _WaitStats] = field(default_factory=lambda: {p: _WaitStats() for p in Priority})
+
+    @staticmethod
+    def estimate_tokens(prompt: str, max_tokens: int) -> int:
+        """Estimation grossière (~4 caractères par token) avant l'appel"""
+        return len(prompt) // 4 + max_tokens
+
+    async def acquire(self, game_id: str, tokens: int, priority: Optional[Priority] = None) -> Grant:
+        """Attend une place dans les budgets pour un appel de la partie donnée"""
+        priority = _current_priority.get() if priority is None else priority
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), tokens, time.monotonic())
+        self._queues[priority].setdefault(game_id, deque()).append(waiter)
+        self._dispatch()
+
+        try:
+            return await waiter.future
+        except asyncio.CancelledError:
+            self._remove(waiter)
+            raise
+
+    def record_usage(self, grant: Grant, tokens: int):
+        """Remplace l'estimation par la consommation réelle de l'appel"""
+        grant.tokens = tokens
+        self._dispatch()
+
+    def promote(self, game_id: str, from_priority: Priority, to_priority: Priority = Priority.INTERACTIVE):
+        """Fait passer les appels en attente d'une partie dans une classe plus prioritaire"""
+        waiters = self._queues[from_priority].pop(game_id, None)
+        if waiters:
+            self._queues[to_priority].setdefault(game_id, deque()).extend(waiters)
+            self._dispatch()
+
+    def queue_depth(self) -> int:
+        """Nombre d'appels en attente de leur place, toutes priorités confondues"""
+        return sum(
+            1 for queues in self._queues.values() for waiters in queues.values()
+            for waiter in waiters if not waiter.future.done()
+        )
+
+    def stats(self) -> dict:
+        """Profondeur des files, attente observée et consommation de la fenêtre courante"""
+        self._prune(time.monotonic())
+        return {
+            "budgets": {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+            },
+            "window": {
+                "requests": len(self._grants),
+                "tokens": sum(g.tokens for g in self._grants),
+            },
+            "queue_depth": {
+                p.name.lower(): sum(len(q) for q in self._queues[p].values()) for p in Priority
+            },
+            "wait_ms": {
+                p.name.lower(): {
+                    "count": s.count,
+                    "avg": round(s.total / s.count * 1000, 1) if s.count else 0.0,
+                    "max": round(s.max * 1000, 1),
+                }
+                for p, s in self._wait_stats.items()
+            },
+        }
+
+    def _prune(self, now: float):
+        while self._grants and self._grants[0].granted_at <= now - self.window:
+            self._grants.popleft()
+
+    def _has_budget(self, tokens: int) -> bool:
+        if len(self._grants) >= self.requests_per_minute:
+            return False
+        # Fenêtre vide : toujours accepter, même une requête plus grosse que le budget
+        return not self._grants or sum(g.tokens for g in self._grants) + tokens <= self.tokens_per_minute
+
+    def _next_waiter(self) -> Optional[tuple[Priority, str]]:
+        """Priorité la plus haute, puis première partie dans l'ordre du tourniquet"""
+        for priority in Priority:
+            queues = self._queues[priority]
+            for game_id in list(queues):
+                waiters = queues[game_id]
+                while waiters and waiters[0].future.done():
+                    waiters.popleft()
+                if waiters:
+                    return priority, game_id
+                del queues[game_id]
+        return None
+
+    def _dispatch(self):
+        now = time.monotonic()
+        self._prune(now)
+
+        while (head := self._next_waiter()) is not None:
+            priority, game_id = head
+            queues = self._queues[priority]
+            waiter = queues[game_id][0]
+            if not self._has_budget(waiter.tokens):
+                self._schedule_retry(now)
+                return
+
+            queues[game_id].popleft()
+            # La partie servie passe en fin de tourniquet
+            queues.move_to_end(game_id)
+            if not queues[game_id]:
+                del queues[game_id]
+
+            grant = Grant(now, waiter.tokens)
+            self._grants.append(grant)
+            stats = self._wait_stats[priority]
+            waited = now - waiter.enqueued_at
+            stats.count += 1
+            stats.total += waited
+            stats.max = max(stats.max, waited)
+            waiter.future.set_result(grant)
+
+    def _schedule_retry(self, now: float):
+        """Réessaie quand la plus ancienne place de la fenêtre expire"""
+        if self._retry_handle and not self._retry_handle.cancelled():
+            self._retry_handle.cancel()
+        delay = max(self._grants[0].granted_at + self.window - now, 0.01) if self._grants else 0.01
+        self._retry_handle = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _remove(self, waiter: _Waiter):
+        for queues in self._queues.values():
+            for waiters in queues.values():
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                    return
+
+
+# Instance globale de l'ordonnanceur
+_llm_scheduler: LLMScheduler | None = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Récupère ou crée l'ordonnanceur partagé par tout le processus"""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        _llm_scheduler = LLMScheduler(
+            requests_per_minute=int(os.environ.get("ANTHROPIC_RPM", "50")),
+            tokens_per_minute=int(os.environ.get("ANTHROPIC_TPM", "50000")),
+        )
+    return _llm_scheduler
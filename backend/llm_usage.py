@@ -0,0 +1,191 @@
+"""
+Comptabilité des tokens et du coût des appels LLM (par partie, agent, type d'appel
+et jour) et budgets de tokens par partie
+"""
+import os
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+from .metrics import LLM_COST_USD, LLM_DOWNGRADED_CALLS, LLM_TOKENS
+
+
+# Prix en dollars par million de tokens : (entrée, sortie, lecture cache, écriture cache)
+MODEL_PRICES: dict[str, tuple[float, float, float, float]] = {
+    "claude-haiku-4-5-20251001": (1.00, 5.00, 0.10, 1.25),
+}
+
+# Types d'appel dont on peut se passer (repli heuristique) dès le seuil souple
+NON_ESSENTIAL_CALLS = {"discussion", "summary"}
+
+# Budget par défaut d'une partie, en tokens facturés (0 = illimité)
+DEFAULT_GAME_BUDGET = int(os.environ.get("LLM_GAME_TOKEN_BUDGET", "0"))
+# Fraction du budget à partir de laquelle les appels non essentiels passent en repli
+SOFT_BUDGET_RATIO = float(os.environ.get("LLM_SOFT_BUDGET_RATIO", "0.8"))
+
+
+class TokenBudgetExceeded(Exception):
+    """L'appel n'est pas fait : la partie a dépassé son budget (le repli heuristique prend le relais)"""
+
+
+@dataclass
+class TokenUsage:
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    calls: int = 0
+    cost_usd: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens + self.cache_read_tokens + self.cache_write_tokens
+
+    def add(self, other: "TokenUsage"):
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    def to_dict(self) -> dict:
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "total_tokens": self.total_tokens,
+            "calls": self.calls,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+
+@dataclass
+class GameUsage:
+    """Consommation d'une partie et ses agrégats"""
+    total: TokenUsage = field(default_factory=TokenUsage)
+    by_agent: dict[str, TokenUsage] = field(default_factory=dict)
+    by_call_type: dict[str, TokenUsage] = field(default_factory=dict)
+    by_day: dict[int, TokenUsage] = field(default_factory=dict)
+    budget: Optional[int] = None
+    downgraded: dict[str, int] = field(default_factory=lambda: {"soft": 0, "hard": 0})
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total.to_dict(),
+            "budget": {
+                "tokens": self.budget,
+                "remaining": max(self.budget - self.total.total_tokens, 0) if self.budget else None,
+                "downgraded_calls": dict(self.downgraded),
+            },
+            "by_agent": {k: v.to_dict() for k, v in self.by_agent.items()},
+            "by_call_type": {k: v.to_dict() for k, v in self.by_call_type.items()},
+            "by_day": {str(k): v.to_dict() for k, v in sorted(self.by_day.items())},
+        }
+
+
+def usage_from_response(response, model: str) -> TokenUsage:
+    """Lit response.usage (les champs de cache peuvent être absents ou None)"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return TokenUsage()
+    record = TokenUsage(
+        input_tokens=getattr(usage, "input_tokens", 0) or 0,
+        output_tokens=getattr(usage, "output_tokens", 0) or 0,
+        cache_read_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+        cache_write_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        calls=1,
+    )
+    prices = MODEL_PRICES.get(model)
+    if prices:
+        record.cost_usd = (
+            record.input_tokens * prices[0] + record.output_tokens * prices[1]
+            + record.cache_read_tokens * prices[2] + record.cache_write_tokens * prices[3]
+        ) / 1_000_000
+    return record
+
+
+class UsageLedger:
+    """Registre de consommation de toutes les parties du processus"""
+
+    def __init__(self, default_budget: int = 0, soft_ratio: float = 0.8):
+        self.default_budget = default_budget
+        self.soft_ratio = soft_ratio
+        self.games: dict[str, GameUsage] = {}
+        self.total = TokenUsage()
+
+    def _game(self, game_id: str) -> GameUsage:
+        if game_id not in self.games:
+            self.games[game_id] = GameUsage(budget=self.default_budget or None)
+        return self.games[game_id]
+
+    def set_budget(self, game_id: str, tokens: Optional[int]):
+        """Budget en tokens facturés de la partie (None ou 0 = illimité)"""
+        self._game(game_id).budget = tokens or None
+
+    def restore(self, game_id: str, usage: GameUsage):
+        """Reprend la consommation d'une partie restaurée (le total du processus n'en tient pas compte)"""
+        self.games[game_id] = usage
+
+    def drop(self, game_id: str):
+        """Oublie une partie retirée du moteur (le total du processus est conservé)"""
+        self.games.pop(game_id, None)
+
+    def budget(self, game_id: str) -> Optional[int]:
+        game = self.games.get(game_id)
+        return game.budget if game else None
+
+    def check_budget(self, game_id: str, call_type: str) -> bool:
+        """
+        Vérifie qu'un appel peut partir. Renvoie False au-delà du seuil souple
+        (l'appel part, mais sans requête de couverture).
+
+        Raises:
+            TokenBudgetExceeded au-delà du budget, ou au-delà du seuil souple pour un appel non essentiel
+        """
+        game = self._game(game_id)
+        if not game.budget:
+            return True
+        used = game.total.total_tokens
+        if used >= game.budget:
+            game.downgraded["hard"] += 1
+            LLM_DOWNGRADED_CALLS.inc(call_type=call_type, reason="hard")
+            raise TokenBudgetExceeded(f"Budget de {game.budget} tokens épuisé")
+        if used >= game.budget * self.soft_ratio:
+            if call_type in NON_ESSENTIAL_CALLS:
+                game.downgraded["soft"] += 1
+                LLM_DOWNGRADED_CALLS.inc(call_type=call_type, reason="soft")
+                raise TokenBudgetExceeded(f"Seuil souple du budget atteint ({used}/{game.budget} tokens)")
+            return False
+        return True
+
+    def record(self, game_id: str, agent: str, call_type: str, day: int, usage: TokenUsage):
+        game = self._game(game_id)
+        for bucket in (
+            game.total,
+            game.by_agent.setdefault(agent, TokenUsage()),
+            game.by_call_type.setdefault(call_type, TokenUsage()),
+            game.by_day.setdefault(day, TokenUsage()),
+            self.total,
+        ):
+            bucket.add(usage)
+
+        LLM_TOKENS.inc(usage.input_tokens, call_type=call_type, kind="input")
+        LLM_TOKENS.inc(usage.output_tokens, call_type=call_type, kind="output")
+        LLM_TOKENS.inc(usage.cache_read_tokens, call_type=call_type, kind="cache_read")
+        LLM_TOKENS.inc(usage.cache_write_tokens, call_type=call_type, kind="cache_write")
+        LLM_COST_USD.inc(usage.cost_usd, call_type=call_type)
+
+    def game_usage(self, game_id: str) -> Optional[GameUsage]:
+        return self.games.get(game_id)
+
+    def stats(self) -> dict:
+        return {"total": self.total.to_dict(), "games": len(self.games)}
+
+
+# Registre global
+_usage_ledger: UsageLedger | None = None
+
+
+def get_usage_ledger() -> UsageLedger:
+    """Récupère ou crée le registre partagé par tout le processus"""
+    global _usage_ledger
+    if _usage_ledger is None:
+        _usage_ledger = UsageLedger(DEFAULT_GAME_BUDGET, SOFT_BUDGET_RATIO)
+    return _usage_ledger
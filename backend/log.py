@@ -0,0 +1,108 @@
+"""
+Structured, non-blocking logging: one logger per subsystem, records handed to a
+background thread through a queue so the event loop never waits on log I/O
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import Optional
+
+
+ROOT = "werewolf"
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Logger of a subsystem (night, day, discussion, ai, tts, api...)"""
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {k: v for k, v in vars(record).items() if k not in _RECORD_FIELDS}
+
+
+class TextFormatter(logging.Formatter):
+    """`time LEVEL [subsystem] message key=value...`"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(subsystem)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.subsystem = record.name.removeprefix(f"{ROOT}.")
+        line = super().format(record)
+        fields = _extra_fields(record)
+        fields.pop("subsystem", None)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "subsystem": record.name.removeprefix(f"{ROOT}."),
+            "message": record.getMessage(),
+            **_extra_fields(record),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _parse_levels(spec: str) -> dict[str, str]:
+    """"night=DEBUG,tts=WARNING" -> {"night": "DEBUG", "tts": "WARNING"}"""
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging():
+    """
+    Configure the werewolf loggers from the environment (idempotent):
+    LOG_LEVEL (default INFO), LOG_LEVELS per subsystem, LOG_FORMAT text|json.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    root = logging.getLogger(ROOT)
+    root.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+    for subsystem, level in _parse_levels(os.environ.get("LOG_LEVELS", "")).items():
+        get_logger(subsystem).setLevel(level)
+
+    writer = logging.StreamHandler(sys.stdout)
+    writer.setFormatter(JSONFormatter() if os.environ.get("LOG_FORMAT") == "json" else TextFormatter())
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(records, writer, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush pending records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        root = logging.getLogger(ROOT)
+        for handler in list(root.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                root.removeHandler(handler)
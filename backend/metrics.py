@@ -0,0 +1,220 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format
+"""
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    """Base of every metric: subclasses set kind and render their samples"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """Sample lines of the metric, in exposition format"""
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self.values: dict[tuple[str, ...], float] = {} if labels else {(): 0}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels):
+        self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        """Increment for the duration of the block"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the (unlabelled) value from function at every scrape"""
+        self._function = function
+
+    def _samples(self) -> list[str]:
+        if self._function is not None:
+            return [f"{self.name} {_format_value(self._function())}"]
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count of observations"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self.series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        counts, total = self.series.setdefault(self._key(labels), ([0] * len(self.buckets), [0.0]))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        total[0] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of the block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Every metric of the process, in registration order"""
+
+    def __init__(self):
+        self.metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_CALL_SECONDS: Histogram = REGISTRY.register(Histogram(
+    "werewolf_llm_call_seconds", "Anthropic API call latency by call type", ("call_type",)
+))
+LLM_CALLS_IN_FLIGHT: Gauge = REGISTRY.register(Gauge(
+    "werewolf_llm_calls_in_flight", "Anthropic API calls currently running"
+))
+ACTION_SECONDS: Histogram = REGISTRY.register(Histogram(
+    "werewolf_action_seconds", "End-to-end processing time of a player action", ("action",)
+))
+DISCUSSION_ROUND_SECONDS: Histogram = REGISTRY.register(Histogram(
+    "werewolf_discussion_round_seconds", "Duration of one AI discussion round"
+))
+TTS_FIRST_BYTE_SECONDS: Histogram = REGISTRY.register(Histogram(
+    "werewolf_tts_first_byte_seconds", "Time to the first audio chunk of a TTS line"
+))
+TTS_TOTAL_SECONDS: Histogram = REGISTRY.register(Histogram(
+    "werewolf_tts_total_seconds", "Time to the last audio chunk of a TTS line"
+))
+LLM_TOKENS: Counter = REGISTRY.register(Counter(
+    "werewolf_llm_tokens_total", "Tokens billed by call type and kind (input, output, cache_read, cache_write)",
+    ("call_type", "kind")
+))
+LLM_COST_USD: Counter = REGISTRY.register(Counter(
+    "werewolf_llm_cost_usd_total", "Estimated LLM cost in US dollars by call type", ("call_type",)
+))
+LLM_DOWNGRADED_CALLS: Counter = REGISTRY.register(Counter(
+    "werewolf_llm_downgraded_calls_total", "LLM calls replaced by a fallback because of a game token budget",
+    ("call_type", "reason")
+))
+LIVE_GAMES: Gauge = REGISTRY.register(Gauge(
+    "werewolf_live_games", "Games currently in progress"
+))
+JOBS_QUEUED: Gauge = REGISTRY.register(Gauge(
+    "werewolf_jobs_queued", "Engine jobs waiting for a worker"
+))
+JOB_SECONDS: Histogram = REGISTRY.register(Histogram(
+    "werewolf_job_seconds", "Run time of an engine job by kind and final status", ("kind", "status")
+))
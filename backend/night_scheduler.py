@@ -0,0 +1,82 @@
+"""
+Ordonnanceur en graphe de dépendances pour la résolution de la nuit
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from .tracing import span
+
+
+@dataclass
+class NightNode:
+    """Tâche nocturne avec ses entrées déclarées (noms d'autres nœuds)"""
+    name: str
+    run: Callable[[dict[str, Any]], Awaitable[Any]]  # reçoit {nom_entrée -> résultat}
+    inputs: list[str] = field(default_factory=list)
+
+
+# Hook appelé à la fin de chaque nœud : (nom, durée en secondes, erreur éventuelle)
+NodeHook = Callable[[str, float, Optional[BaseException]], None]
+
+
+def _topological_order(nodes: list[NightNode]) -> list[NightNode]:
+    """Trie les nœuds pour que chaque entrée précède son consommateur"""
+    by_name = {node.name: node for node in nodes}
+    ordered: list[NightNode] = []
+    state: dict[str, str] = {}  # nom -> "visiting" | "done"
+
+    def visit(node: NightNode):
+        if state.get(node.name) == "done":
+            return
+        if state.get(node.name) == "visiting":
+            raise ValueError(f"Cycle de dépendances sur le nœud {node.name}")
+        state[node.name] = "visiting"
+        for dep in node.inputs:
+            if dep not in by_name:
+                raise ValueError(f"Entrée inconnue {dep} pour le nœud {node.name}")
+            visit(by_name[dep])
+        state[node.name] = "done"
+        ordered.append(node)
+
+    for node in nodes:
+        visit(node)
+    return ordered
+
+
+async def run_night_dag(nodes: list[NightNode], on_node_done: Optional[NodeHook] = None) -> dict[str, Any]:
+    """
+    Exécute le graphe avec un parallélisme maximal : chaque nœud démarre dès que
+    toutes ses entrées sont résolues.
+
+    Returns:
+        résultats par nom de nœud (l'exception levée si le nœud a échoué)
+    """
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def execute(node: NightNode):
+        inputs = {}
+        for dep in node.inputs:
+            try:
+                inputs[dep] = await tasks[dep]
+            except Exception:
+                inputs[dep] = None  # Une entrée en échec est transmise comme absente
+
+        start = time.perf_counter()
+        error = None
+        try:
+            with span(f"night.{node.name}"):
+                return await node.run(inputs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if on_node_done:
+                on_node_done(node.name, time.perf_counter() - start, error)
+
+    for node in _topological_order(nodes):
+        tasks[node.name] = asyncio.create_task(execute(node))
+
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    return dict(zip(tasks.keys(), results))
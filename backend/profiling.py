@@ -0,0 +1,108 @@
+"""
+Opt-in per-request profiling: runs selected requests under a profiler and writes
+the result to a local directory, tagged with the endpoint and game_id
+"""
+import asyncio
+import cProfile
+import os
+import random
+import re
+import time
+from pathlib import Path
+
+from .log import get_logger
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+
+profile_log = get_logger("profiling")
+
+PROFILE_HEADER = b"x-profile"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling a request from its arrival to the last body chunk
+    (streaming responses included).
+
+    A request is profiled when the X-Profile header is set or, otherwise, with
+    probability sample_rate. pyinstrument (statistical, async-aware, HTML output)
+    is used when installed, cProfile (deterministic, .prof for pstats/snakeviz)
+    otherwise. Work running in threads (the Anthropic client) is not captured
+    by cProfile, and both profilers see every coroutine sharing the event loop.
+    """
+
+    def __init__(self, app, directory: str, sample_rate: float = 0.0, header_enabled: bool = True):
+        self.app = app
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.header_enabled = header_enabled
+        # Only one profiler can be active per process: concurrent selected requests run unprofiled
+        self._active = False
+
+    def _selected(self, scope) -> bool:
+        if self.header_enabled and any(
+            name == PROFILE_HEADER and value not in (b"", b"0") for name, value in scope.get("headers", [])
+        ):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if pyinstrument:
+            profiler = pyinstrument.Profiler(async_mode="enabled")
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        self._active = True
+        started = time.time()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if pyinstrument:
+                profiler.stop()
+            else:
+                profiler.disable()
+            self._active = False
+            await asyncio.to_thread(self._save, profiler, scope, started)
+
+    def _save(self, profiler, scope, started: float):
+        # The router stores the matched route and path parameters in the scope
+        route = scope.get("route")
+        endpoint = getattr(route, "path", None) or scope.get("path", "unknown")
+        game_id = scope.get("path_params", {}).get("game_id", "nogame")
+        name = "{}-{}-{}-{}".format(
+            time.strftime("%Y%m%d-%H%M%S", time.localtime(started)),
+            scope.get("method", "GET"),
+            re.sub(r"[^A-Za-z0-9_.-]+", "_", endpoint).strip("_"),
+            game_id,
+        )
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if pyinstrument:
+                path = self.directory / f"{name}.html"
+                path.write_text(profiler.output_html())
+            else:
+                path = self.directory / f"{name}.prof"
+                profiler.dump_stats(path)
+            profile_log.info("Profile written to %s", path, extra={"endpoint": endpoint, "game_id": game_id})
+        except OSError as e:
+            profile_log.warning("Profile export failed: %s", e)
+
+
+def profiling_settings() -> dict | None:
+    """Middleware options from the environment, or None when profiling is off (PROFILING unset)"""
+    if os.environ.get("PROFILING", "0") != "1":
+        return None
+    return {
+        "directory": os.environ.get("PROFILE_DIR", ".profiles"),
+        "sample_rate": float(os.environ.get("PROFILE_SAMPLE_RATE", "0")),
+        "header_enabled": os.environ.get("PROFILE_HEADER", "1") == "1",
+    }
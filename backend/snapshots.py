@@ -0,0 +1,361 @@
+"""
+Instantanés binaires versionnés de l'état d'une partie (GameState, mémoire et
+personnalités des agents, état des discussions), pour migrer une partie entre
+processus ou survivre à un redéploiement
+"""
+import asyncio
+import os
+import struct
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+import msgpack
+
+from .ai_players import AIMemory, AIPersonality
+from .llm_usage import GameUsage, TokenUsage, get_usage_ledger
+from .log import get_logger
+from .models import (
+    GameState, GameStatus, NightActions, Phase, Player, Role, WitchPotions
+)
+
+if TYPE_CHECKING:
+    from .game_engine import GameEngine
+    from .game_events import EventLog
+
+
+snapshot_log = get_logger("snapshots")
+
+MAGIC = b"LGS"
+# À incrémenter à chaque changement de la disposition ci-dessous (restore_game refuse les autres versions)
+SNAPSHOT_VERSION = 3
+_HEADER = struct.Struct(">3sB")
+
+# Champs de AIMemory, dans l'ordre de l'instantané, et leur type
+_MEMORY_FIELDS = (
+    "known_roles", "suspicions", "accusations_made", "accusations_received",
+    "votes_history", "deaths_witnessed", "conversations", "day_summaries",
+)
+_MEMORY_TYPES = (dict, dict, list, list, list, list, list, dict)
+# Champs de AIPersonality, dans le même ordre
+_PERSONALITY_TYPES = (str, str, list, str, str, str)
+# Champs de TokenUsage (tokens, appels, coût)
+_TOKEN_USAGE_TYPES = (int, int, int, int, int, float)
+
+
+class SnapshotError(Exception):
+    """Instantané illisible, d'une autre version, ou état non sérialisable"""
+
+
+def _pack_player(p: Player) -> list:
+    return [p.name, p.role.value, p.is_alive, p.is_human, p.personality, p.voice_id]
+
+
+def _unpack_player(data: list) -> Player:
+    name, role, is_alive, is_human, personality, voice_id = data
+    return Player(name, Role(role), is_alive, is_human, personality, voice_id)
+
+
+def _pack_personality(p: AIPersonality) -> list:
+    return [p.name, p.description, p.traits, p.speech_style, p.gender, p.voice_id]
+
+
+def _pack_token_usage(u: TokenUsage) -> list:
+    return [getattr(u, f.name) for f in fields(TokenUsage)]
+
+
+def _pack_usage(usage: Optional[GameUsage]) -> Optional[list]:
+    """Consommation de la partie, pour qu'une partie restaurée ne reparte pas avec tout son budget"""
+    if usage is None:
+        return None
+    return [
+        _pack_token_usage(usage.total),
+        {k: _pack_token_usage(v) for k, v in usage.by_agent.items()},
+        {k: _pack_token_usage(v) for k, v in usage.by_call_type.items()},
+        {k: _pack_token_usage(v) for k, v in usage.by_day.items()},
+        usage.budget,
+        usage.downgraded,
+    ]
+
+
+def _unpack_usage(data) -> Optional[GameUsage]:
+    if data is None:
+        return None
+    total, by_agent, by_call_type, by_day, budget, downgraded = data
+
+    def tokens(values, what: str) -> TokenUsage:
+        return TokenUsage(*_checked(values, _TOKEN_USAGE_TYPES, what))
+
+    if budget is not None and not isinstance(budget, int):
+        raise ValueError("budget : entier attendu")
+    return GameUsage(
+        total=tokens(total, "consommation totale"),
+        by_agent={k: tokens(v, f"consommation de {k}") for k, v in _checked_dict(by_agent, "par agent").items()},
+        by_call_type={
+            k: tokens(v, f"consommation {k}") for k, v in _checked_dict(by_call_type, "par type d'appel").items()
+        },
+        by_day={int(k): tokens(v, f"consommation du jour {k}") for k, v in _checked_dict(by_day, "par jour").items()},
+        budget=budget,
+        downgraded=_checked_dict(downgraded, "appels dégradés"),
+    )
+
+
+def _pack_event_log(log: Optional["EventLog"]) -> Optional[list]:
+    """Événements et points de reprise : l'historique de la partie reste rejouable après restauration"""
+    if log is None:
+        return None
+    return [[event.to_dict() for event in log.events], [[count, state] for count, state in log.checkpoints]]
+
+
+def _unpack_event_log(data) -> Optional["EventLog"]:
+    # game_events dépend de ce module (pack_game_state) : import au moment de la restauration
+    from .game_events import EventLog, event_from_dict
+
+    if data is None:
+        return None
+    events, checkpoints = data
+    return EventLog(
+        events=[event_from_dict(_checked_dict(event, "événement")) for event in events],
+        checkpoints=[tuple(_checked(c, (int, bytes), "point de reprise")) for c in checkpoints],
+    )
+
+
+def _checked(values, types: tuple, what: str) -> list:
+    """Valeurs positionnelles d'un objet, vérifiées contre les types attendus"""
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError(f"{what} : {len(types)} champs attendus")
+    for value, expected in zip(values, types):
+        if not isinstance(value, expected):
+            raise ValueError(f"{what} : {expected.__name__} attendu, {type(value).__name__} reçu")
+    return values
+
+
+def _checked_dict(value, what: str) -> dict:
+    if not isinstance(value, dict):
+        raise ValueError(f"{what} : dictionnaire attendu")
+    return value
+
+
+def pack_game_state(game: GameState) -> list:
+    """GameState sous forme de tableaux positionnels (aussi utilisé par les points de reprise du journal)"""
+    return [
+        game.game_id,
+        [_pack_player(p) for p in game.players],
+        game.phase.value,
+        game.day_number,
+        game.status.value,
+        [game.witch_potions.has_life_potion, game.witch_potions.has_death_potion],
+        [
+            game.night_actions.wolf_victim, game.night_actions.seer_target,
+            game.night_actions.seer_result, game.night_actions.witch_save,
+            game.night_actions.witch_kill,
+        ],
+        game.history,
+        game.pending_action,
+        game.discussions_history,
+        game.seer_discoveries,
+    ]
+
+
+def unpack_game_state(data: list) -> GameState:
+    (game_id, players, phase, day_number, status, potions, night,
+     history, pending_action, discussions_history, seer_discoveries) = data
+    return GameState(
+        game_id=game_id,
+        players=[_unpack_player(p) for p in players],
+        phase=Phase(phase),
+        day_number=day_number,
+        status=GameStatus(status),
+        witch_potions=WitchPotions(*potions),
+        night_actions=NightActions(*night),
+        history=history,
+        pending_action=pending_action,
+        discussions_history=discussions_history,
+        seer_discoveries=seer_discoveries,
+    )
+
+
+def _unsupported(value):
+    raise SnapshotError(f"Valeur non sérialisable dans l'état de la partie : {type(value).__name__}")
+
+
+def snapshot_game(engine: "GameEngine", game_id: str) -> bytes:
+    """
+    Sérialise tout l'état d'une partie détenu par le moteur.
+    Les tâches en cours (nuit spéculative, résumés) ne sont pas sauvegardées :
+    après restauration, le moteur refait ces appels au besoin.
+
+    Raises:
+        KeyError si la partie n'existe pas
+    """
+    game = engine.games[game_id]
+    agents = engine.ai_agents.get(game_id, {})
+    payload = [
+        pack_game_state(game),
+        {name: _pack_personality(p) for name, p in engine.personalities.get(game_id, {}).items()},
+        {name: [getattr(a.memory, f) for f in _MEMORY_FIELDS] for name, a in agents.items()},
+        engine.discussions_cache.get(game_id, []),
+        engine.discussion_state.get(game_id),
+        _pack_usage(get_usage_ledger().game_usage(game_id)),
+        _pack_event_log(engine.event_logs.get(game_id)),
+    ]
+    return _HEADER.pack(MAGIC, SNAPSHOT_VERSION) + msgpack.packb(payload, default=_unsupported)
+
+
+@dataclass
+class _Snapshot:
+    """Contenu décodé et vérifié d'un instantané, prêt à être installé dans le moteur"""
+    game: GameState
+    personalities: dict[str, AIPersonality]
+    memories: dict[str, AIMemory]
+    discussions: list
+    discussion_state: Optional[dict]
+    usage: Optional[GameUsage]
+    event_log: Optional["EventLog"]
+
+
+def _read_snapshot(data: bytes) -> _Snapshot:
+    """
+    Vérifie l'en-tête, décode et valide tout l'instantané
+
+    Raises:
+        SnapshotError si l'instantané est illisible, incomplet ou d'une autre version
+    """
+    if len(data) < _HEADER.size:
+        raise SnapshotError("Instantané tronqué")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("Ce n'est pas un instantané de partie")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Version d'instantané {version} non prise en charge (attendue : {SNAPSHOT_VERSION})")
+    try:
+        game_data, personalities, memories, discussions, discussion_state, usage, event_log = msgpack.unpackb(
+            data[_HEADER.size:], strict_map_key=False
+        )
+        if not isinstance(discussions, list):
+            raise ValueError("discussions : liste attendue")
+        if discussion_state is not None and not isinstance(discussion_state, dict):
+            raise ValueError("état des discussions : dictionnaire attendu")
+        return _Snapshot(
+            game=unpack_game_state(game_data),
+            personalities={
+                name: AIPersonality(*_checked(p, _PERSONALITY_TYPES, f"personnalité de {name}"))
+                for name, p in _checked_dict(personalities, "personnalités").items()
+            },
+            memories={
+                name: AIMemory(*_checked(m, _MEMORY_TYPES, f"mémoire de {name}"))
+                for name, m in _checked_dict(memories, "mémoires").items()
+            },
+            discussions=discussions,
+            discussion_state=discussion_state,
+            usage=_unpack_usage(usage),
+            event_log=_unpack_event_log(event_log),
+        )
+    except (ValueError, TypeError, KeyError, msgpack.UnpackException) as e:
+        raise SnapshotError(f"Instantané corrompu : {e}") from e
+
+
+def snapshot_game_id(data: bytes) -> str:
+    """
+    ID de la partie contenue dans un instantané
+
+    Raises:
+        SnapshotError si l'instantané est illisible ou d'une autre version
+    """
+    return _read_snapshot(data).game.game_id
+
+
+def restore_game(engine: "GameEngine", data: bytes) -> GameState:
+    """
+    Recrée une partie dans le moteur à partir d'un instantané (remplace celle de même ID).
+    Tout l'instantané est validé avant de toucher à la partie existante.
+
+    Raises:
+        SnapshotError si l'instantané est illisible, incomplet ou d'une autre version
+    """
+    snapshot = _read_snapshot(data)
+    game = snapshot.game
+    game_id = game.game_id
+    engine.discard_game(game_id)
+    engine.games[game_id] = game
+    engine.personalities[game_id] = snapshot.personalities
+    engine.discussions_cache[game_id] = snapshot.discussions
+    if snapshot.discussion_state is not None:
+        engine.discussion_state[game_id] = snapshot.discussion_state
+    if snapshot.usage is not None:
+        get_usage_ledger().restore(game_id, snapshot.usage)
+
+    engine._init_ai_agents(game)
+    for name, agent in engine.ai_agents[game_id].items():
+        if name in snapshot.memories:
+            agent.memory = snapshot.memories[name]
+    if snapshot.event_log is not None:
+        engine.event_logs[game_id] = snapshot.event_log
+    else:
+        # Instantané sans journal : il repart d'un point de reprise sur l'état restauré
+        engine.start_event_log(game)
+    return game
+
+
+class SnapshotStore:
+    """Un fichier par partie dans un répertoire, remplacé atomiquement à chaque sauvegarde"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, game_id: str) -> Path:
+        return self.directory / f"{game_id}.snap"
+
+    def write(self, game_id: str, data: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self._path(game_id).with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, self._path(game_id))
+
+    def save(self, engine: "GameEngine", game_id: str):
+        """Instantané pris immédiatement (cohérent), écriture sur disque synchrone"""
+        self.write(game_id, snapshot_game(engine, game_id))
+
+    async def save_async(self, engine: "GameEngine", game_id: str):
+        """Instantané pris immédiatement, écriture hors de la boucle d'événements"""
+        data = snapshot_game(engine, game_id)
+        try:
+            await asyncio.to_thread(self.write, game_id, data)
+        except OSError as e:
+            snapshot_log.warning("Échec de l'écriture de l'instantané : %s", e, extra={"game_id": game_id})
+
+    def save_all(self, engine: "GameEngine") -> int:
+        saved = 0
+        for game_id in list(engine.games):
+            try:
+                self.save(engine, game_id)
+                saved += 1
+            except (OSError, SnapshotError) as e:
+                snapshot_log.warning("Instantané non sauvegardé : %s", e, extra={"game_id": game_id})
+        return saved
+
+    def restore_all(self, engine: "GameEngine") -> int:
+        """Restaure toutes les parties du répertoire (les instantanés illisibles sont ignorés)"""
+        restored = 0
+        for path in sorted(self.directory.glob("*.snap")):
+            try:
+                restore_game(engine, path.read_bytes())
+                restored += 1
+            except (OSError, SnapshotError) as e:
+                snapshot_log.warning("Instantané %s ignoré : %s", path.name, e)
+        return restored
+
+    def delete(self, game_id: str):
+        self._path(game_id).unlink(missing_ok=True)
+
+
+# Stockage global (None si SNAPSHOT_DIR n'est pas défini)
+_snapshot_store: SnapshotStore | None = None
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Récupère ou crée le stockage des instantanés ; None si SNAPSHOT_DIR n'est pas défini"""
+    global _snapshot_store
+    if _snapshot_store is None and os.environ.get("SNAPSHOT_DIR"):
+        _snapshot_store = SnapshotStore(os.environ["SNAPSHOT_DIR"])
+    return _snapshot_store
@@ -0,0 +1,74 @@
+"""
+Startup benchmark: import time of backend.api, lifespan startup and first request,
+each measured in a fresh interpreter
+
+    python -m backend.startup_benchmark [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+_CHILD = r"""
+import json, time
+start = time.perf_counter()
+import backend.api
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(backend.api.app)
+ready = time.perf_counter()
+with client:
+    started = time.perf_counter()
+    client.get("/")
+    answered = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "startup": started - ready,
+    "first_request": answered - started,
+}))
+"""
+
+
+def _run_child(extra_args: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *extra_args, "-c", _CHILD],
+        capture_output=True, text=True, check=True,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+
+
+def _slowest_imports(stderr: str, count: int) -> list[tuple[str, float]]:
+    """Modules imported directly by a top-level import, by cumulative import time (-X importtime)"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2  # nested imports are indented by two spaces
+        if depth == 1:
+            modules.append((name.strip(), int(cumulative) / 1000))
+    return sorted(modules, key=lambda m: m[1], reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    samples = [json.loads(_run_child([]).stdout.strip().splitlines()[-1]) for _ in range(args.runs)]
+    print(f"{'phase':<15}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for phase in ("import", "startup", "first_request"):
+        values = [s[phase] * 1000 for s in samples]
+        print(f"{phase:<15}{statistics.median(values):>12.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+    print("\nSlowest imports (cumulative ms):")
+    for name, ms in _slowest_imports(_run_child(["-X", "importtime"]).stderr, args.top):
+        print(f"  {ms:>8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
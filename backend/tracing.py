@@ -0,0 +1,197 @@
+"""
+Lightweight in-process tracing: nested spans per engine operation, exported as
+Chrome trace JSON (chrome://tracing, Perfetto, speedscope)
+"""
+import asyncio
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .log import get_logger
+
+
+trace_log = get_logger("tracing")
+
+TRACING_ENABLED = os.environ.get("TRACING", "1") != "0"
+# Directory where every finished trace is written (nothing is written when unset)
+TRACE_DIR = os.environ.get("TRACE_DIR")
+
+_ids = itertools.count(1)
+
+
+@dataclass
+class Span:
+    name: str
+    trace: "Trace" = field(repr=False)
+    parent: Optional["Span"] = field(repr=False)
+    attributes: dict[str, Any]
+    start: float = field(default_factory=time.perf_counter)
+    end: Optional[float] = None
+    span_id: int = field(default_factory=lambda: next(_ids))
+    error: Optional[str] = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+@dataclass
+class Trace:
+    """Every span under one root span (one engine operation)"""
+    trace_id: int
+    spans: list[Span] = field(default_factory=list)
+
+    @property
+    def root(self) -> Span:
+        return self.spans[0]
+
+    def attribute(self, key: str) -> Any:
+        """First value of an attribute, searching from the root"""
+        for s in self.spans:
+            if key in s.attributes:
+                return s.attributes[key]
+        return None
+
+    def to_chrome(self, pid: Optional[int] = None) -> list[dict]:
+        """Complete ("X") events; overlapping siblings are spread over separate lanes"""
+        pid = self.trace_id if pid is None else pid
+        origin = self.root.start
+        lanes: list[list[Span]] = []  # per lane, the stack of spans still open
+        lane_of: dict[int, int] = {}
+        events = [{
+            "name": "process_name", "ph": "M", "pid": pid,
+            "args": {"name": f"{self.root.name} {self.root.attributes}"},
+        }]
+
+        for s in sorted(self.spans, key=lambda s: (s.start, -(s.end or s.start))):
+            end = s.end if s.end is not None else s.start
+            preferred = [lane_of[s.parent.span_id]] if s.parent and s.parent.span_id in lane_of else []
+            for lane in preferred + list(range(len(lanes))):
+                stack = lanes[lane]
+                while stack and (stack[-1].end or stack[-1].start) <= s.start:
+                    stack.pop()
+                if not stack or (stack[-1].end or stack[-1].start) >= end:
+                    break
+            else:
+                lanes.append([])
+                lane = len(lanes) - 1
+            lanes[lane].append(s)
+            lane_of[s.span_id] = lane
+
+            args = dict(s.attributes)
+            if s.error:
+                args["error"] = s.error
+            events.append({
+                "name": s.name, "ph": "X", "pid": pid, "tid": lane,
+                "ts": round((s.start - origin) * 1e6, 1),
+                "dur": round((end - s.start) * 1e6, 1),
+                "args": args,
+            })
+        return events
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+# Most recent finished traces, for the API
+recent_traces: deque[Trace] = deque(maxlen=int(os.environ.get("TRACE_KEEP", "100")))
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a block as a child of the current span (or as the root of a new trace).
+    Tasks created inside the block inherit it as their parent.
+    """
+    if not TRACING_ENABLED:
+        yield None
+        return
+
+    parent = _current_span.get()
+    trace = parent.trace if parent else Trace(next(_ids))
+    current = Span(name, trace, parent, attributes)
+    trace.spans.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = repr(e)
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _current_span.reset(token)
+        if parent is None:
+            _finish(trace)
+
+
+def traced(name: str, attributes: Optional[Callable[..., dict]] = None):
+    """Decorator: run the (sync or async) function inside span(name, **attributes(*args, **kwargs))"""
+    def decorate(function):
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                with span(name, **(attributes(*args, **kwargs) if attributes else {})):
+                    return await function(*args, **kwargs)
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with span(name, **(attributes(*args, **kwargs) if attributes else {})):
+                    return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def detached():
+    """Tasks created in this block start their own traces (background work outliving the caller)"""
+    token = _current_span.set(None)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+
+def _finish(trace: Trace):
+    recent_traces.append(trace)
+    if TRACE_DIR:
+        _export_in_background(trace)
+
+
+def traces_for_game(game_id: str) -> list[Trace]:
+    return [t for t in recent_traces if t.attribute("game_id") == game_id]
+
+
+def chrome_trace(traces: list[Trace]) -> dict:
+    """One Chrome trace document, one process per trace"""
+    events = []
+    for trace in traces:
+        events.extend(trace.to_chrome())
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _write(trace: Trace):
+    directory = Path(TRACE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    game_id = trace.attribute("game_id") or "nogame"
+    day = trace.attribute("day")
+    name = f"{game_id}-day{day}-{trace.root.name}-{trace.trace_id}.json"
+    try:
+        (directory / name).write_text(json.dumps(chrome_trace([trace]), default=str))
+    except OSError as e:
+        trace_log.warning("Trace export failed: %s", e)
+
+
+def _export_in_background(trace: Trace):
+    """Write the trace file off the event loop"""
+    try:
+        asyncio.get_running_loop().run_in_executor(None, _write, trace)
+    except RuntimeError:
+        threading.Thread(target=_write, args=(trace,), daemon=True).start()
@@ -0,0 +1,128 @@
+"""
+Content-addressed TTS audio cache: in-memory hot tier + disk, byte-bounded LRU
+"""
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+
+def cache_key(text: str, voice_id: str, setup: dict) -> str:
+    """Hash of text, voice and model settings"""
+    payload = json.dumps({"text": text, "voice_id": voice_id, "setup": setup}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _LRUBytes:
+    """LRU index key -> size, bounded in bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.sizes: OrderedDict[str, int] = OrderedDict()
+        self.total = 0
+
+    def touch(self, key: str):
+        self.sizes.move_to_end(key)
+
+    def add(self, key: str, size: int) -> list[str]:
+        """Add an entry and return the evicted keys"""
+        if key in self.sizes:
+            self.total -= self.sizes.pop(key)
+        self.sizes[key] = size
+        self.total += size
+        evicted = []
+        while self.total > self.max_bytes and len(self.sizes) > 1:
+            old_key, old_size = self.sizes.popitem(last=False)
+            self.total -= old_size
+            evicted.append(old_key)
+        return evicted
+
+
+class TTSCache:
+    """Synthesized PCM, in memory for hot lines and on disk for the rest"""
+
+    def __init__(self, directory: str, max_disk_bytes: int, max_memory_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.memory: dict[str, bytes] = {}
+        self.memory_lru = _LRUBytes(max_memory_bytes)
+        self.disk_lru = _LRUBytes(max_disk_bytes)
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self.bytes_saved = 0
+        self._load_index()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pcm"
+
+    def _load_index(self):
+        """Rebuild the disk LRU index, oldest files first"""
+        files = sorted(self.directory.glob("*.pcm"), key=lambda f: f.stat().st_mtime)
+        for f in files:
+            for evicted in self.disk_lru.add(f.stem, f.stat().st_size):
+                self._path(evicted).unlink(missing_ok=True)
+
+    def _remember(self, key: str, data: bytes):
+        self.memory[key] = data
+        for evicted in self.memory_lru.add(key, len(data)):
+            self.memory.pop(evicted, None)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Cached audio, or None"""
+        data = self.memory.get(key)
+        if data is not None:
+            self.memory_lru.touch(key)
+            if key in self.disk_lru.sizes:
+                self.disk_lru.touch(key)
+            self.hits["memory"] += 1
+            self.bytes_saved += len(data)
+            return data
+
+        if key in self.disk_lru.sizes:
+            try:
+                data = await asyncio.to_thread(self._path(key).read_bytes)
+            except FileNotFoundError:
+                self.disk_lru.total -= self.disk_lru.sizes.pop(key)
+            else:
+                self.disk_lru.touch(key)
+                self._remember(key, data)
+                self.hits["disk"] += 1
+                self.bytes_saved += len(data)
+                return data
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, data: bytes):
+        """Store a complete utterance (never an interrupted stream)"""
+        if not data:
+            return
+        self._remember(key, data)
+        await asyncio.to_thread(self._path(key).write_bytes, data)
+        for evicted in self.disk_lru.add(key, len(data)):
+            self._path(evicted).unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        hits = self.hits["memory"] + self.hits["disk"]
+        lookups = hits + self.misses
+        return {
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "memory_bytes": self.memory_lru.total,
+            "disk_bytes": self.disk_lru.total,
+            "entries": len(self.disk_lru.sizes),
+        }
+
+
+def create_tts_cache(namespace: str) -> TTSCache:
+    """Cache configured from environment variables, one directory per TTS provider"""
+    return TTSCache(
+        directory=os.path.join(os.environ.get("TTS_CACHE_DIR", ".tts_cache"), namespace),
+        max_disk_bytes=int(os.environ.get("TTS_CACHE_MAX_BYTES", str(500 * 1024 * 1024))),
+        max_memory_bytes=int(os.environ.get("TTS_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024))),
+    )
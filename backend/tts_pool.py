@@ -0,0 +1,190 @@
+"""
+Pool of upstream TTS sessions: warm-up, keep-alive and a bound on concurrent streams
+"""
+import asyncio
+import inspect
+import os
+import time
+from typing import AsyncGenerator, Callable, Optional
+
+from .log import get_logger
+from .tts_providers import TTSProvider
+
+tts_log = get_logger("tts")
+
+
+class _Session:
+    """One provider instance (one client/connection) and its usage"""
+
+    def __init__(self, provider: TTSProvider):
+        self.provider = provider
+        self.active = 0
+        self.last_used = 0.0
+        self.warmed = False
+
+
+class TTSSessionPool:
+    """
+    Fixed set of provider sessions shared by every TTS stream.
+
+    At most max_streams upstream streams run at once; extra requests wait in
+    FIFO order and each new stream goes to the least busy session.
+    """
+
+    def __init__(
+        self,
+        create: Callable[[], TTSProvider],
+        size: int = 2,
+        max_streams: int = 8,
+        warmup_text: str = "Bonjour.",
+        keepalive_interval: float = 0.0
+    ):
+        self._create = create
+        self.size = size
+        self.max_streams = max_streams
+        self.warmup_text = warmup_text
+        self.keepalive_interval = keepalive_interval
+        self.warmup_setup: dict = {}
+        self.sessions: list[_Session] = []
+        self._retired: list[_Session] = []  # replaced sessions still serving a stream
+        self._closing: set[asyncio.Task] = set()
+        self._slots = asyncio.Semaphore(max_streams)
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self.queued = 0
+        self.active = 0
+        self.counts = {"streams": 0, "queued": 0, "warmups": 0, "failed_warmups": 0}
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _ensure_sessions(self):
+        if not self.sessions:
+            self.sessions = [_Session(self._create()) for _ in range(self.size)]
+
+    def replace_sessions(self, create: Callable[[], TTSProvider]):
+        """
+        Rebuild every session (e.g. after an API key change). Idle old sessions are
+        closed now; busy ones finish their streams and are closed after the last one.
+        """
+        self._create = create
+        old, self.sessions = self.sessions, []
+        for session in old:
+            self._retired.append(session)
+            self._retire_if_idle(session)
+
+    def _retire_if_idle(self, session: _Session):
+        """Close a replaced session in the background once no stream uses it"""
+        if session.active or session not in self._retired:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._close_session(session))
+        except RuntimeError:
+            return  # no loop: left to close()
+        self._retired.remove(session)
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_session(self, session: _Session):
+        close = getattr(session.provider, "close", None)
+        if close:
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                tts_log.warning("Closing session failed: %s", e)
+
+    async def start(self, warmup_setup: dict, warm_up: bool = True):
+        """Open the sessions, warm them up and start the keep-alive loop"""
+        self.warmup_setup = warmup_setup
+        self._ensure_sessions()
+        if warm_up:
+            await asyncio.gather(*(self._warm(session) for session in self.sessions))
+        if self.keepalive_interval > 0 and self._keepalive_task is None:
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+
+    async def close(self):
+        """Stop the keep-alive loop and close every session's client"""
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        await asyncio.gather(*self._closing, return_exceptions=True)
+        for session in self.sessions + self._retired:
+            await self._close_session(session)
+        self.sessions = []
+        self._retired = []
+
+    async def _warm(self, session: _Session):
+        """Synthesize a short line so connection setup is paid before the first real request"""
+        try:
+            async for _ in session.provider.stream(self.warmup_text, self.warmup_setup):
+                pass
+            session.warmed = True
+            session.last_used = time.monotonic()
+            self.counts["warmups"] += 1
+        except Exception as e:
+            self.counts["failed_warmups"] += 1
+            tts_log.warning("Warm-up failed: %s", e)
+
+    async def _keepalive(self):
+        """Re-warm sessions idle for longer than the keep-alive interval"""
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            now = time.monotonic()
+            idle = [s for s in self.sessions if s.active == 0 and now - s.last_used >= self.keepalive_interval]
+            await asyncio.gather(*(self._warm(session) for session in idle))
+
+    async def stream(self, text: str, setup: dict) -> AsyncGenerator[bytes, None]:
+        """Stream from the least busy session once a stream slot is free"""
+        enqueued_at = time.monotonic()
+        if self._slots.locked():
+            self.counts["queued"] += 1
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        waited = time.monotonic() - enqueued_at
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.counts["streams"] += 1
+
+        self._ensure_sessions()
+        session = min(self.sessions, key=lambda s: s.active)
+        session.active += 1
+        self.active += 1
+        try:
+            async for chunk in session.provider.stream(text, setup):
+                yield chunk
+        finally:
+            session.active -= 1
+            self.active -= 1
+            session.last_used = time.monotonic()
+            self._slots.release()
+            self._retire_if_idle(session)
+
+    def stats(self) -> dict:
+        """Sessions, stream slots in use, queue depth and observed wait"""
+        streams = self.counts["streams"]
+        return {
+            "sessions": len(self.sessions),
+            "warmed_sessions": sum(s.warmed for s in self.sessions),
+            "max_streams": self.max_streams,
+            "active_streams": self.active,
+            "queue_depth": self.queued,
+            **self.counts,
+            "wait_ms": {
+                "avg": round(self.wait_total / streams * 1000, 1) if streams else 0.0,
+                "max": round(self.wait_max * 1000, 1),
+            },
+        }
+
+
+def create_tts_pool(create: Callable[[], TTSProvider]) -> TTSSessionPool:
+    """Pool configured from environment variables"""
+    return TTSSessionPool(
+        create,
+        size=int(os.environ.get("TTS_POOL_SIZE", "2")),
+        max_streams=int(os.environ.get("TTS_MAX_STREAMS", "8")),
+        warmup_text=os.environ.get("TTS_WARMUP_TEXT", "Bonjour."),
+        keepalive_interval=float(os.environ.get("TTS_KEEPALIVE_INTERVAL", "0")),
+    )
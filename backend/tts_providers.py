@@ -0,0 +1,124 @@
+"""
+TTS providers: the upstream that turns text into PCM int16 mono @ 48kHz
+"""
+import asyncio
+import hashlib
+import importlib.util
+import os
+from typing import TYPE_CHECKING, AsyncIterator, Protocol
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def gradium_available() -> bool:
+    """Whether the Gradium SDK is installed (without importing it)"""
+    return importlib.util.find_spec("gradium") is not None
+
+
+class TTSProvider(Protocol):
+    """Upstream text-to-speech engine used by TTSService"""
+
+    name: str
+
+    def stream(self, text: str, setup: dict) -> AsyncIterator[bytes]:
+        """Yield PCM int16 mono chunks for the text"""
+        ...
+
+
+class GradiumProvider:
+    """Gradium streaming TTS"""
+
+    name = "gradium"
+
+    def __init__(self, api_key: str | None = None):
+        if not gradium_available():
+            raise RuntimeError("Gradium is not installed")
+        import gradium
+        api_key = api_key or os.environ.get("GRADIUM_API_KEY", "gsk_1de33236e6c36ec2379faf64378a9067931f304a598028a32157558a11439d36")
+        self.client = gradium.client.GradiumClient(api_key=api_key)
+
+    async def stream(self, text: str, setup: dict) -> AsyncIterator[bytes]:
+        stream = await self.client.tts_stream(setup=setup, text=text)
+        async for chunk in stream.iter_bytes():
+            yield chunk
+
+    async def close(self):
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+
+
+class SyntheticProvider:
+    """
+    Offline stand-in for load testing: deterministic tone or noise whose duration
+    is proportional to the text length, delivered with configurable latency and jitter.
+    """
+
+    name = "synthetic"
+
+    def __init__(
+        self,
+        sample_rate: int = 48000,
+        chunk_samples: int = 3840,
+        ms_per_char: float = 60.0,
+        first_chunk_ms: float = 150.0,
+        chunk_latency_ms: float = 20.0,
+        jitter_ms: float = 10.0,
+        signal: str = "tone"
+    ):
+        self.sample_rate = sample_rate
+        self.chunk_samples = chunk_samples
+        self.ms_per_char = ms_per_char
+        self.first_chunk_ms = first_chunk_ms
+        self.chunk_latency_ms = chunk_latency_ms
+        self.jitter_ms = jitter_ms
+        self.signal = signal
+
+    @classmethod
+    def from_env(cls) -> "SyntheticProvider":
+        return cls(
+            ms_per_char=float(os.environ.get("TTS_SYNTHETIC_MS_PER_CHAR", "60")),
+            first_chunk_ms=float(os.environ.get("TTS_SYNTHETIC_FIRST_CHUNK_MS", "150")),
+            chunk_latency_ms=float(os.environ.get("TTS_SYNTHETIC_CHUNK_MS", "20")),
+            jitter_ms=float(os.environ.get("TTS_SYNTHETIC_JITTER_MS", "10")),
+            signal=os.environ.get("TTS_SYNTHETIC_SIGNAL", "tone"),
+        )
+
+    async def stream(self, text: str, setup: dict) -> AsyncIterator[bytes]:
+        import numpy as np
+        voice_id = setup.get("voice_id", "")
+        seed = int.from_bytes(hashlib.sha256(f"{voice_id}|{text}".encode("utf-8")).digest()[:8], "little")
+        rng = np.random.default_rng(seed)
+        # Each voice gets its own pitch
+        frequency = 110 + int.from_bytes(hashlib.sha256(voice_id.encode("utf-8")).digest()[:2], "little") % 220
+        total = int(len(text) * self.ms_per_char / 1000 * self.sample_rate)
+
+        await asyncio.sleep(self._delay(rng, self.first_chunk_ms))
+        for start in range(0, total, self.chunk_samples):
+            n = min(self.chunk_samples, total - start)
+            if self.signal == "noise":
+                samples = rng.normal(0, 3000, n)
+            else:
+                t = np.arange(start, start + n) / self.sample_rate
+                samples = 8000 * np.sin(2 * np.pi * frequency * t)
+            yield np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+            await asyncio.sleep(self._delay(rng, self.chunk_latency_ms))
+
+    def _delay(self, rng: "np.random.Generator", base_ms: float) -> float:
+        return max(base_ms + rng.uniform(-self.jitter_ms, self.jitter_ms), 0) / 1000
+
+
+def provider_name() -> str:
+    """Provider selected by TTS_PROVIDER ("gradium" by default, or "synthetic")"""
+    return os.environ.get("TTS_PROVIDER", "gradium")
+
+
+def create_provider(name: str, api_key: str | None = None) -> TTSProvider:
+    if name == "synthetic":
+        return SyntheticProvider.from_env()
+    if name == "gradium":
+        return GradiumProvider(api_key)
+    raise ValueError(f"Unknown TTS provider: {name}")
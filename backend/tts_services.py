@@ -2,32 +2,130 @@
 Text-to-Speech service using Gradium for the Werewolf game
 """
 import asyncio
-import gradium
-import numpy as np
-from typing import AsyncGenerator
+from collections import OrderedDict, deque
+from typing import AsyncGenerator, AsyncIterable
 import os
+import re
+import time
 
+from .log import get_logger
+from .metrics import TTS_FIRST_BYTE_SECONDS, TTS_TOTAL_SECONDS
+from .tts_cache import cache_key, create_tts_cache
+from .tts_pool import create_tts_pool
+from .tts_providers import create_provider, gradium_available, provider_name
+
+
+tts_log = get_logger("tts")
+
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+')
 
-class TTSService:
-    """Text-to-speech service with Gradium"""
+
+def split_sentences(text: str, min_length: int = 20) -> list[str]:
+    """Split text into sentences, merging fragments too short to sound natural alone"""
+    sentences = []
+    for part in _SENTENCE_END.split(text.strip()):
+        if sentences and len(sentences[-1]) < min_length:
+            sentences[-1] = f"{sentences[-1]} {part}"
+        elif part:
+            sentences.append(part)
+    # A short last fragment ("Non.") joins the sentence before it
+    if len(sentences) > 1 and len(sentences[-1]) < min_length:
+        last = sentences.pop()
+        sentences[-1] = f"{sentences[-1]} {last}"
+    return sentences
+
+
+class _Broadcast:
+    """Chunks of one upstream TTS stream, replayed to late joiners then followed live"""
 
     def __init__(self):
-        self.client = None
-        self.sample_rate = 48000
-        self.chunk_size = 3840  # 80ms @ 48kHz
+        self.chunks: list[bytes] = []
+        self.done = False
+        self.error: Exception | None = None
+        self._changed = asyncio.Event()
+
+    def publish(self, chunk: bytes):
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self, error: Exception | None = None):
+        self.done = True
+        self.error = error
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self) -> AsyncGenerator[bytes, None]:
+        index = 0
+        while True:
+            while index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            if self.done:
+                if self.error:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class TTSService:
+    """Text-to-speech service with Gradium (or another TTSProvider)"""
 
-    def _get_client(self):
-        """Get or create Gradium client"""
-        if not gradium:
-            raise RuntimeError("Gradium is not installed")
-        if self.client is None:
-            api_key = os.environ.get("GRADIUM_API_KEY", "gsk_1de33236e6c36ec2379faf64378a9067931f304a598028a32157558a11439d36")
-            self.client = gradium.client.GradiumClient(api_key=api_key)
-        return self.client
+    def __init__(self, provider: str | None = None):
+        self.provider_name = provider or provider_name()
+        # Upstream sessions, bounded in concurrent streams
+        self.pool = create_tts_pool(lambda: create_provider(self.provider_name))
+        self.sample_rate = 48000
+        self.chunk_size = 3840  # samples, 80ms @ 48kHz
+        self.cache = create_tts_cache(self.provider_name)
+        # Background pre-synthesis of discussion lines (created lazily inside the event loop)
+        self.presynthesis_queue: asyncio.Queue | None = None
+        self.presynthesis_workers: list[asyncio.Task] = []
+        self.presynthesis_max_queue = int(os.environ.get("TTS_PRESYNTHESIS_QUEUE", "32"))
+        self.presynthesis_concurrency = int(os.environ.get("TTS_PRESYNTHESIS_WORKERS", "2"))
+        self.presynthesis_counts = {"queued": 0, "completed": 0, "dropped": 0, "failed": 0, "late": 0}
+        self._presynthesis_pending: set[str] = set()  # cache keys queued or in progress
+        # Cache key -> completion time, oldest first; lines never requested are evicted past the limit
+        self._presynthesized_at: OrderedDict[str, float] = OrderedDict()
+        self.presynthesis_tracked = int(os.environ.get("TTS_PRESYNTHESIS_TRACKED", "1024"))
+        self.ahead_margins: deque[float] = deque(maxlen=200)  # seconds between ready and requested
+        # Single-flight: one upstream stream per distinct utterance, shared by concurrent listeners
+        self._inflight: dict[str, _Broadcast] = {}
+        self._upstream_tasks: set[asyncio.Task] = set()  # strong refs, the loop only keeps weak ones
+        self.single_flight_counts = {"upstream": 0, "coalesced": 0}
+        # Sentences synthesized ahead of the one currently streaming
+        self.sentence_lookahead = int(os.environ.get("TTS_SENTENCE_LOOKAHEAD", "1"))
 
     def set_api_key(self, api_key: str):
         """Configure Gradium API key"""
-        self.client = gradium.client.GradiumClient(api_key=api_key)
+        if self.provider_name == "gradium":
+            self.pool.replace_sessions(lambda: create_provider(self.provider_name, api_key))
+
+    async def start(self, warm_up: bool = True):
+        """Open (and optionally warm up) the upstream sessions"""
+        await self.pool.start(self._setup("YTpq7expH9539ERJ"), warm_up=warm_up)
+
+    async def close(self):
+        """Stop background work and close upstream sessions"""
+        for task in self.presynthesis_workers:
+            task.cancel()
+        self.presynthesis_workers = []
+        self.presynthesis_queue = None
+        for task in self._upstream_tasks:
+            task.cancel()
+        await asyncio.gather(*self._upstream_tasks, return_exceptions=True)
+        await self.pool.close()
+
+    def _setup(self, voice_id: str) -> dict:
+        """Gradium stream setup (also part of the cache key)"""
+        return {
+            "model_name": "default",
+            "voice_id": voice_id,
+            "output_format": "pcm",
+            'json_config':{'padding_bonus':-3}
+        }
 
     async def text_to_speech_stream(
         self,
@@ -35,7 +133,7 @@ class TTSService:
         voice_id: str = "YTpq7expH9539ERJ"
     ) -> AsyncGenerator[bytes, None]:
         """
-        Generate audio stream from text
+        Generate audio stream from text, served from the cache when possible
 
         Args:
             text: Text to synthesize
@@ -44,30 +142,245 @@ class TTSService:
         Yields:
             audio chunks in PCM int16 format
         """
-        client = self._get_client()
-        print(f"[TTS] START - Generating audio for text: {text[:100]}..." if len(text) > 100 else f"[TTS] START - Generating audio for text: {text}")
+        self._record_request(cache_key(text, voice_id, self._setup(voice_id)))
+        start = time.perf_counter()
+        first = True
+        async for chunk in self._speak(text, voice_id):
+            if first:
+                TTS_FIRST_BYTE_SECONDS.observe(time.perf_counter() - start)
+                first = False
+            yield chunk
+        TTS_TOTAL_SECONDS.observe(time.perf_counter() - start)
+
+    async def _speak(self, text: str, voice_id: str) -> AsyncGenerator[bytes, None]:
+        """Single sentences go straight to synthesis, longer lines are pipelined per sentence"""
+        sentences = split_sentences(text)
+        if len(sentences) <= 1:
+            setup = self._setup(voice_id)
+            async for chunk in self._synthesize(text, voice_id, setup, cache_key(text, voice_id, setup)):
+                yield chunk
+            return
+
+        async def iterate():
+            for sentence in sentences:
+                yield sentence
+
+        async for chunk in self.sentences_to_speech_stream(iterate(), voice_id):
+            yield chunk
 
+    async def sentences_to_speech_stream(
+        self,
+        sentences: AsyncIterable[str],
+        voice_id: str = "YTpq7expH9539ERJ"
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Synthesize sentences as they arrive, with bounded overlap: sentence N+1
+        starts while sentence N streams. Output is stitched in order.
+
+        Args:
+            sentences: Sentences to speak, possibly produced while the LLM is still writing
+            voice_id: Gradium voice ID to use
+
+        Yields:
+            audio chunks in PCM int16 format
+        """
+        setup = self._setup(voice_id)
+        slots = asyncio.Semaphore(self.sentence_lookahead + 1)
+        order: asyncio.Queue = asyncio.Queue()  # per-sentence chunk queues, in speaking order
+        producers: list[asyncio.Task] = []
+
+        async def produce(sentence: str, queue: asyncio.Queue):
+            try:
+                async for chunk in self._synthesize(sentence, voice_id, setup, cache_key(sentence, voice_id, setup)):
+                    queue.put_nowait(chunk)
+            except Exception as e:
+                queue.put_nowait(e)
+            finally:
+                queue.put_nowait(None)
+
+        async def feed():
+            try:
+                async for sentence in sentences:
+                    if not sentence.strip():
+                        continue
+                    await slots.acquire()
+                    queue = asyncio.Queue()
+                    producers.append(asyncio.create_task(produce(sentence, queue)))
+                    order.put_nowait(queue)
+            finally:
+                order.put_nowait(None)
+
+        feeder = asyncio.create_task(feed())
         try:
-            stream = await client.tts_stream(
-                setup={
-                    "model_name": "default",
-                    "voice_id": voice_id,
-                    "output_format": "pcm",
-                    'json_config':{'padding_bonus':-3}
-                },
-                text=text
-            )
-
-            chunk_count = 0
-            async for chunk in stream.iter_bytes():
-                chunk_count += 1
+            while (queue := await order.get()) is not None:
+                while (chunk := await queue.get()) is not None:
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    yield chunk
+                slots.release()
+        finally:
+            feeder.cancel()
+            for task in producers:
+                task.cancel()
+
+    async def _synthesize(self, text: str, voice_id: str, setup: dict, key: str) -> AsyncGenerator[bytes, None]:
+        """Serve from an in-flight stream, the cache, or a new Gradium stream"""
+        broadcast = self._inflight.get(key)
+        if broadcast is not None:
+            # Same utterance already streaming: replay what was received, then follow live
+            self.single_flight_counts["coalesced"] += 1
+            tts_log.debug("COALESCED - joining in-flight stream (%d chunks received)", len(broadcast.chunks))
+            async for chunk in broadcast.subscribe():
                 yield chunk
+            return
+
+        cached = await self.cache.get(key)
+        if cached is not None:
+            tts_log.debug("CACHE HIT - %d bytes for text: %.100s", len(cached), text)
+            frame_bytes = self.chunk_size * 2
+            for i in range(0, len(cached), frame_bytes):
+                yield cached[i:i + frame_bytes]
+            return
+
+        broadcast = _Broadcast()
+        self._inflight[key] = broadcast
+        self.single_flight_counts["upstream"] += 1
+        # The upstream stream runs in its own task so it survives its first listener leaving
+        task = asyncio.create_task(self._stream_upstream(text, setup, key, broadcast))
+        self._upstream_tasks.add(task)
+        task.add_done_callback(self._upstream_tasks.discard)
+        async for chunk in broadcast.subscribe():
+            yield chunk
+
+    async def _stream_upstream(self, text: str, setup: dict, key: str, broadcast: "_Broadcast"):
+        """Read one upstream stream into a broadcast buffer, then cache it"""
+        tts_log.debug("START - Generating audio for text: %.100s", text)
+
+        try:
+            try:
+                async for chunk in self.pool.stream(text, setup):
+                    broadcast.publish(chunk)
+            except Exception as e:
+                tts_log.error("TTS error: %s", e)
+                broadcast.finish(error=e)
+                return
+            except asyncio.CancelledError:
+                # Listeners see an upstream failure; only this task is being cancelled
+                broadcast.finish(error=RuntimeError("upstream TTS cancelled"))
+                raise
+
+            # Listeners are released first; the in-flight entry stays until the cache has the audio
+            broadcast.finish()
+            tts_log.debug("END - Audio generated successfully (%d chunks, %d characters)", len(broadcast.chunks), len(text))
+            try:
+                # Only complete utterances are cached
+                await self.cache.put(key, b''.join(broadcast.chunks))
+            except Exception as e:
+                tts_log.warning("TTS cache write failed: %s", e)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def stream_lines(
+        self, lines: list[tuple[str, str]]
+    ) -> AsyncGenerator[tuple[int, bytes | Exception | None], None]:
+        """
+        Synthesize every (text, voice_id) line concurrently, yielding in playback order
+
+        Yields:
+            (line index, PCM chunk), then (line index, None) once the line is complete,
+            or (line index, exception) instead if its synthesis failed
+        """
+        queues = [asyncio.Queue() for _ in lines]
+
+        async def produce(index: int, text: str, voice_id: str):
+            try:
+                async for chunk in self.text_to_speech_stream(text, voice_id):
+                    queues[index].put_nowait(chunk)
+            except Exception as e:
+                tts_log.error("Line %d failed: %s", index, e)
+                queues[index].put_nowait(e)
+            finally:
+                queues[index].put_nowait(None)
+
+        tasks = [asyncio.create_task(produce(i, text, voice_id)) for i, (text, voice_id) in enumerate(lines)]
+        try:
+            for index, queue in enumerate(queues):
+                last = None
+                while (last := await queue.get()) is not None and not isinstance(last, Exception):
+                    yield index, last
+                if isinstance(last, Exception):
+                    await queue.get()  # terminator
+                yield index, last
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def presynthesize(self, text: str, voice_id: str = "YTpq7expH9539ERJ"):
+        """
+        Queue a line for background synthesis so it is cached before the browser asks for it.
+        Lines are dropped (not awaited) when the queue is full.
+        """
+        if not text or not text.strip():
+            return
+        key = cache_key(text, voice_id, self._setup(voice_id))
+        if key in self._presynthesis_pending or key in self._presynthesized_at:
+            return
+
+        if self.presynthesis_queue is None:
+            self.presynthesis_queue = asyncio.Queue(maxsize=self.presynthesis_max_queue)
+            self.presynthesis_workers = [
+                asyncio.create_task(self._presynthesis_worker())
+                for _ in range(self.presynthesis_concurrency)
+            ]
+
+        try:
+            self.presynthesis_queue.put_nowait((text, voice_id, key))
+        except asyncio.QueueFull:
+            self.presynthesis_counts["dropped"] += 1
+            return
+        self._presynthesis_pending.add(key)
+        self.presynthesis_counts["queued"] += 1
+
+    async def _presynthesis_worker(self):
+        """Drain the pre-synthesis queue into the cache"""
+        while True:
+            text, voice_id, key = await self.presynthesis_queue.get()
+            try:
+                async for _ in self._speak(text, voice_id):
+                    pass
+                self._presynthesized_at[key] = time.monotonic()
+                while len(self._presynthesized_at) > self.presynthesis_tracked:
+                    self._presynthesized_at.popitem(last=False)
+                self.presynthesis_counts["completed"] += 1
+            except Exception as e:
+                self.presynthesis_counts["failed"] += 1
+                tts_log.warning("Pre-synthesis failed: %s", e)
+            finally:
+                self._presynthesis_pending.discard(key)
+                self.presynthesis_queue.task_done()
 
-            print(f"[TTS] END - Audio generated successfully ({chunk_count} chunks, {len(text)} characters)")
+    def _record_request(self, key: str):
+        """Measure how far ahead of the browser request pre-synthesis finished"""
+        completed_at = self._presynthesized_at.pop(key, None)
+        if completed_at is not None:
+            self.ahead_margins.append(time.monotonic() - completed_at)
+        elif key in self._presynthesis_pending:
+            self.presynthesis_counts["late"] += 1
 
-        except Exception as e:
-            print(f"[TTS] ERROR - TTS error: {e}")
-            raise
+    def presynthesis_stats(self) -> dict:
+        """Pre-synthesis queue depth, outcomes and synthesis-ahead margin"""
+        margins = sorted(self.ahead_margins)
+        return {
+            "queue_depth": self.presynthesis_queue.qsize() if self.presynthesis_queue else 0,
+            "in_progress": len(self._presynthesis_pending),
+            **self.presynthesis_counts,
+            "ahead_margin_s": {
+                "count": len(margins),
+                "avg": round(sum(margins) / len(margins), 3) if margins else 0.0,
+                "p50": round(margins[len(margins) // 2], 3) if margins else 0.0,
+                "min": round(margins[0], 3) if margins else 0.0,
+            },
+        }
 
     async def text_to_speech_bytes(
         self,
@@ -84,12 +397,12 @@ class TTSService:
         Returns:
             audio bytes in PCM int16 format
         """
-        print(f"[TTS_BYTES] Collecting complete audio...")
+        tts_log.debug("Collecting complete audio...")
         chunks = []
         async for chunk in self.text_to_speech_stream(text, voice_id):
             chunks.append(chunk)
         audio_bytes = b''.join(chunks)
-        print(f"[TTS_BYTES] Audio ready to play: {len(audio_bytes)} bytes")
+        tts_log.debug("Audio ready to play: %d bytes", len(audio_bytes))
         return audio_bytes
 
 
@@ -98,8 +411,8 @@ _tts_service: TTSService | None = None
 
 
 def get_tts_service():
-    """Get or create TTS service (returns None if gradium is not installed)"""
-    if not gradium:
+    """Get or create TTS service (returns None if gradium is needed but not installed)"""
+    if provider_name() == "gradium" and not gradium_available():
         return None
     global _tts_service
     if _tts_service is None:
@@ -109,7 +422,7 @@ def get_tts_service():
 
 def set_gradium_api_key(api_key: str):
     """Configure Gradium API key"""
-    if not gradium:
+    if not gradium_available():
         raise RuntimeError("Gradium is not installed")
     service = get_tts_service()
     if service:
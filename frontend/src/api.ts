@@ -38,6 +38,25 @@ export async function getGameState(gameId: string): Promise<GameState> {
   return response.json();
 }
 
+interface Job<T> {
+  job_id: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  result: T | null;
+  error: string | null;
+}
+
+// Actions and messages run as background jobs: long-poll the job until it finishes
+async function waitForJob<T>(response: Response): Promise<T> {
+  let job: Job<T> = await response.json();
+  while (job.status === 'queued' || job.status === 'running') {
+    const poll = await fetch(`${API_BASE}/jobs/${job.job_id}?wait=25`);
+    if (!poll.ok) throw new Error('Failed to get job status');
+    job = await poll.json();
+  }
+  if (job.status === 'failed') throw new Error(job.error || 'Job failed');
+  return job.result as T;
+}
+
 export async function sendAction(
   gameId: string,
   action: string,
@@ -54,14 +73,23 @@ export async function sendAction(
     const error = await response.json();
     throw new Error(error.detail || 'Failed to send action');
   }
-  return response.json();
+  return waitForJob<ActionResult>(response);
 }
 
 export async function getDiscussions(gameId: string): Promise<Discussion[]> {
   const response = await fetch(`${API_BASE}/games/${gameId}/discussions`);
   if (!response.ok) throw new Error('Failed to get discussions');
   const data = await response.json();
-  return data.discussions;
+  if (data.discussions.length > 0) return data.discussions;
+
+  // Nothing said yet today: generate the first round as a background job
+  const started = await fetch(`${API_BASE}/games/${gameId}/discussions`, { method: 'POST' });
+  if (!started.ok) {
+    const error = await started.json();
+    throw new Error(error.detail || 'Failed to start discussions');
+  }
+  const result = await waitForJob<{ discussions: Discussion[] }>(started);
+  return result.discussions;
 }
 
 export async function sendMessage(gameId: string, message: string): Promise<{ success: boolean; discussions: Discussion[] }> {
@@ -74,5 +102,5 @@ export async function sendMessage(gameId: string, message: string): Promise<{ su
     const error = await response.json();
     throw new Error(error.detail || 'Failed to send message');
   }
-  return response.json();
+  return waitForJob<{ success: boolean; discussions: Discussion[] }>(response);
 }
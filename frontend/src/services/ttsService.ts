@@ -6,8 +6,10 @@ const API_BASE_URL = 'http://localhost:8000';
 
 export class TTSService {
   private audioContext: AudioContext | null = null;
-  private currentSource: AudioBufferSourceNode | null = null;
+  private scheduledSources: AudioBufferSourceNode[] = [];
+  private reader: ReadableStreamDefaultReader<Uint8Array> | null = null;
   private isPlaying = false;
+  private playbackId = 0;
 
   constructor() {
     // Initialiser l'AudioContext au premier appel pour éviter les problèmes d'autoplay
@@ -21,7 +23,9 @@ export class TTSService {
   }
 
   /**
-   * Joue le texte en utilisant le TTS Gradium
+   * Joue le texte en utilisant le TTS Gradium.
+   * Le flux PCM est lu au fil de l'eau : chaque bloc reçu est converti et programmé
+   * à la suite du précédent, la lecture commence dès le premier bloc.
    */
   async playText(text: string, voiceId: string = 'YTpq7expH9539ERJ'): Promise<void> {
     if (!text || !text.trim()) {
@@ -30,9 +34,11 @@ export class TTSService {
 
     // Arrêter l'audio en cours si nécessaire
     this.stop();
+    const playbackId = ++this.playbackId;
 
     try {
       this.initAudioContext();
+      const context = this.audioContext!;
 
       // Récupérer le stream audio depuis l'API
       const response = await fetch(
@@ -49,54 +55,95 @@ export class TTSService {
         throw new Error(`TTS API error: ${response.statusText}`);
       }
 
-      // Lire le stream en tant que ArrayBuffer
-      const audioData = await response.arrayBuffer();
-
-      if (!audioData || audioData.byteLength === 0) {
+      if (!response.body) {
         console.warn('Empty audio data received');
         return;
       }
 
-      // Convertir PCM int16 en Float32Array pour Web Audio API
-      const pcmData = new Int16Array(audioData);
-      const float32Data = new Float32Array(pcmData.length);
-
-      for (let i = 0; i < pcmData.length; i++) {
-        float32Data[i] = pcmData[i] / 32768.0; // Normaliser de int16 à float32
+      // Une autre lecture a démarré (ou stop() a été appelé) pendant la requête
+      if (playbackId !== this.playbackId) {
+        response.body.cancel().catch(() => {});
+        return;
       }
 
-      // Créer un AudioBuffer
-      const audioBuffer = this.audioContext!.createBuffer(
-        1, // mono
-        float32Data.length,
-        48000 // sample rate
-      );
-
-      // Copier les données dans le buffer
-      audioBuffer.getChannelData(0).set(float32Data);
-
-      // Créer une source et la connecter
-      this.currentSource = this.audioContext!.createBufferSource();
-      this.currentSource.buffer = audioBuffer;
-      this.currentSource.connect(this.audioContext!.destination);
-
-      // Marquer comme en lecture
+      const sampleRate = Number(response.headers.get('X-Sample-Rate')) || 48000;
+      // Lecteur propre à cette lecture : this.reader peut entre-temps appartenir à la suivante
+      const reader = response.body.getReader();
+      this.reader = reader;
       this.isPlaying = true;
 
-      // Jouer l'audio
-      this.currentSource.start();
+      // Petite avance pour absorber la gigue entre deux blocs
+      let nextStartTime = context.currentTime + 0.05;
+      let lastSource: AudioBufferSourceNode | null = null;
+      let leftover: Uint8Array | null = null;
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done || playbackId !== this.playbackId) {
+          break;
+        }
+
+        // Recoller l'octet isolé du bloc précédent (un échantillon int16 = 2 octets)
+        let bytes: Uint8Array = value;
+        if (leftover) {
+          bytes = new Uint8Array(leftover.length + value.length);
+          bytes.set(leftover);
+          bytes.set(value, leftover.length);
+          leftover = null;
+        }
+        const sampleCount = Math.floor(bytes.length / 2);
+        if (bytes.length % 2) {
+          leftover = bytes.slice(bytes.length - 1);
+        }
+        if (sampleCount === 0) {
+          continue;
+        }
+
+        // Convertir PCM int16 en Float32Array pour Web Audio API
+        const pcmData = new Int16Array(bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + sampleCount * 2));
+        const float32Data = new Float32Array(sampleCount);
+        for (let i = 0; i < sampleCount; i++) {
+          float32Data[i] = pcmData[i] / 32768.0; // Normaliser de int16 à float32
+        }
+
+        const audioBuffer = context.createBuffer(1, sampleCount, sampleRate);
+        audioBuffer.getChannelData(0).set(float32Data);
+
+        // Programmer le bloc juste après le précédent
+        const source = context.createBufferSource();
+        source.buffer = audioBuffer;
+        source.connect(context.destination);
+        nextStartTime = Math.max(nextStartTime, context.currentTime);
+        source.start(nextStartTime);
+        nextStartTime += audioBuffer.duration;
+        this.scheduledSources.push(source);
+        lastSource = source;
+      }
+      // Une lecture remplacée ne touche plus à l'état de la suivante
+      if (playbackId !== this.playbackId) {
+        return;
+      }
+      this.reader = null;
+
+      if (!lastSource) {
+        this.isPlaying = false;
+        return;
+      }
 
-      // Attendre la fin de la lecture
+      // Attendre la fin de la lecture du dernier bloc
+      const finalSource = lastSource;
       return new Promise<void>((resolve) => {
-        this.currentSource!.onended = () => {
-          this.isPlaying = false;
-          this.currentSource = null;
+        finalSource.onended = () => {
+          if (playbackId === this.playbackId) {
+            this.isPlaying = false;
+            this.scheduledSources = [];
+          }
           resolve();
         };
 
         // Timeout de sécurité: si l'audio n'a pas fini après 30s, continuer
         setTimeout(() => {
-          if (this.isPlaying) {
+          if (this.isPlaying && playbackId === this.playbackId) {
             this.stop();
             resolve();
           }
@@ -105,7 +152,9 @@ export class TTSService {
 
     } catch (error) {
       console.error('Erreur TTS:', error);
-      this.isPlaying = false;
+      if (playbackId === this.playbackId) {
+        this.isPlaying = false;
+      }
       // Ne pas relancer l'erreur pour permettre à l'affichage de continuer
     }
   }
@@ -114,15 +163,22 @@ export class TTSService {
    * Arrête la lecture en cours
    */
   stop() {
-    if (this.currentSource && this.isPlaying) {
+    this.playbackId++;
+    if (this.reader) {
+      this.reader.cancel().catch(() => {
+        // Ignore les erreurs si le flux est déjà fermé
+      });
+      this.reader = null;
+    }
+    for (const source of this.scheduledSources) {
       try {
-        this.currentSource.stop();
+        source.stop();
       } catch (e) {
         // Ignore les erreurs si déjà arrêté
       }
-      this.currentSource = null;
-      this.isPlaying = false;
     }
+    this.scheduledSources = [];
+    this.isPlaying = false;
   }
 
   /**